@@ -4,23 +4,109 @@ Features: Advanced search, analytics, audit logging, data validation, bulk opera
 Author: Showcasing Database & Python Skills
 """
 
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context, has_request_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import MongoClient, monitoring, ASCENDING, DESCENDING, UpdateOne, UpdateMany, DeleteOne, DeleteMany, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from bson import json_util
+from bson.decimal128 import Decimal128
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
 from datetime import datetime, timedelta, timezone
 import os
 from dotenv import load_dotenv
+import atexit
+import base64
+import bisect
+import hashlib
+import heapq
+import click
+import csv
+import io
 import json
+import math
+import queue
+import random
 import re
+import tempfile
+import unicodedata
+import threading
+import uuid
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+
+try:
+    import orjson  # optional fast JSON backend
+except ImportError:
+    orjson = None
+
+try:
+    import redis  # optional shared tier for the product list response cache
+except ImportError:
+    redis = None
 from enum import Enum
+from marshmallow import Schema, ValidationError, EXCLUDE, fields, missing, validate
 
 # Load environment variables
 load_dotenv()
 
+JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto')  # "auto", "orjson" or "stdlib"
+
+def _encode_datetime(value: datetime) -> str:
+    # MongoDB returns naive datetimes that are always UTC
+    return value.isoformat() if value.tzinfo else value.isoformat() + '+00:00'
+
+# Exact-type dispatch keeps the per-value cost of the JSON default hook to one dict lookup
+BSON_ENCODERS = {
+    ObjectId: str,
+    datetime: _encode_datetime,
+    Decimal128: lambda value: str(value.to_decimal())
+}
+
+def encode_bson_value(value: Any) -> Any:
+    """Encode BSON types that JSON has no native representation for"""
+    encoder = BSON_ENCODERS.get(type(value))
+    if encoder is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return encoder(value)
+
+class MongoJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that natively encodes ObjectId, datetime and Decimal128"""
+    
+    @staticmethod
+    def default(o):
+        encoder = BSON_ENCODERS.get(type(o))
+        if encoder is not None:
+            return encoder(o)
+        return DefaultJSONProvider.default(o)
+
+class OrjsonMongoJSONProvider(MongoJSONProvider):
+    """MongoJSONProvider backed by orjson for faster serialization"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=MongoJSONProvider.default, option=option).decode()
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+def select_json_provider():
+    """Pick the JSON provider class for JSON_BACKEND (orjson when available on auto)"""
+    if JSON_BACKEND == 'orjson' or (JSON_BACKEND == 'auto' and orjson is not None):
+        if orjson is None:
+            raise RuntimeError("JSON_BACKEND=orjson requires the orjson package")
+        return OrjsonMongoJSONProvider
+    return MongoJSONProvider
+
 app = Flask(__name__)
+app.json_provider_class = select_json_provider()
+app.json = app.json_provider_class(app)
 CORS(app)
 
 # Configuration - hardcoded to avoid environment issues
@@ -28,36 +114,272 @@ MONGO_URI = 'mongodb://localhost:27017'
 DATABASE_NAME = 'professional_crud_db'
 ITEMS_PER_PAGE = 10
 
-print(f"🔗 Connecting to: {MONGO_URI}")
-print(f"📊 Database: {DATABASE_NAME}")
+# Tunables (override via environment)
+CATEGORY_CACHE_TTL = int(os.getenv('CATEGORY_CACHE_TTL', 300))
+CATEGORY_CACHE_SIZE = int(os.getenv('CATEGORY_CACHE_SIZE', 1024))
+CATEGORY_CACHE_WATCH = os.getenv('CATEGORY_CACHE_WATCH', 'false').lower() == 'true'
+AUDIT_QUEUE_SIZE = int(os.getenv('AUDIT_QUEUE_SIZE', 10000))
+AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', 500))
+AUDIT_FLUSH_INTERVAL = float(os.getenv('AUDIT_FLUSH_INTERVAL', 1.0))
+AUDIT_BACKPRESSURE = os.getenv('AUDIT_BACKPRESSURE', 'drop')  # "drop" or "block"
+AUDIT_BLOCK_TIMEOUT = float(os.getenv('AUDIT_BLOCK_TIMEOUT', 5.0))
+# Per-action audit policy, e.g. "read=0.05,update=always,delete=always" (always | off | sample rate 0-1)
+AUDIT_POLICY = os.getenv('AUDIT_POLICY', 'read=off')
+AUDIT_READ_AGGREGATE = os.getenv('AUDIT_READ_AGGREGATE', 'true').lower() == 'true'
+ANALYTICS_HOURLY_RETENTION_DAYS = int(os.getenv('ANALYTICS_HOURLY_RETENTION_DAYS', 7))
+ANALYTICS_DAILY_RETENTION_DAYS = int(os.getenv('ANALYTICS_DAILY_RETENTION_DAYS', 365))
+ANALYTICS_PRICE_BUCKETS = [0, 10, 25, 50, 100, 250, 500, 1000]
+CATEGORY_PAGE_SIZE = int(os.getenv('CATEGORY_PAGE_SIZE', 50))
+CATEGORY_MAX_PAGE_SIZE = int(os.getenv('CATEGORY_MAX_PAGE_SIZE', 500))
+# Relative text score weights for product search
+TEXT_INDEX_WEIGHTS = {"name": 10, "tags": 5, "description": 1}
+DASHBOARD_REFRESH_INTERVAL = float(os.getenv('DASHBOARD_REFRESH_INTERVAL', 60))
+DASHBOARD_MIN_REFRESH_INTERVAL = float(os.getenv('DASHBOARD_MIN_REFRESH_INTERVAL', 2))
+DASHBOARD_SNAPSHOT_ID = 'dashboard'
+INVENTORY_STATS_ID = 'inventory'
+PRODUCT_COUNT_CAP = int(os.getenv('PRODUCT_COUNT_CAP', 10000))
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+EXPORT_CHUNK_BYTES = int(os.getenv('EXPORT_CHUNK_BYTES', 64 * 1024))
+VERSION_CACHE_TTL = float(os.getenv('VERSION_CACHE_TTL', 1.0))
+# Cache-Control policies per cacheable route
+CACHE_CONTROL = {
+    'categories': os.getenv('CACHE_CONTROL_CATEGORIES', 'no-cache'),
+    'product': os.getenv('CACHE_CONTROL_PRODUCT', 'no-cache'),
+    'products': os.getenv('CACHE_CONTROL_PRODUCTS', 'no-cache'),
+    'dashboard': os.getenv('CACHE_CONTROL_DASHBOARD', 'private, max-age=10')
+}
+RESPONSE_CACHE_ENTRIES = int(os.getenv('RESPONSE_CACHE_ENTRIES', 512))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 300))
+RESPONSE_CACHE_REDIS_URL = os.getenv('RESPONSE_CACHE_REDIS_URL', '')
+VIEW_FLUSH_INTERVAL = float(os.getenv('VIEW_FLUSH_INTERVAL', 5.0))
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', 1000))
+BULK_FILTER_MAX_MATCHES = int(os.getenv('BULK_FILTER_MAX_MATCHES', 10000))
+IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 1000))
+IMPORT_PARALLELISM = int(os.getenv('IMPORT_PARALLELISM', 4))
+IMPORT_MAX_ERRORS = int(os.getenv('IMPORT_MAX_ERRORS', 1000))
+# Fraction of product list queries whose plan is captured with explain() (0 disables instrumentation)
+QUERY_PLANNER_SAMPLE_RATE = float(os.getenv('QUERY_PLANNER_SAMPLE_RATE', 0.0))
+QUERY_PLANNER_EXPLAIN_INTERVAL = float(os.getenv('QUERY_PLANNER_EXPLAIN_INTERVAL', 300))
+QUERY_PLANNER_MAX_SHAPES = int(os.getenv('QUERY_PLANNER_MAX_SHAPES', 500))
+SUGGEST_LIMIT = int(os.getenv('SUGGEST_LIMIT', 10))
+SUGGEST_MAX_LIMIT = int(os.getenv('SUGGEST_MAX_LIMIT', 50))
+SUGGEST_REFRESH_INTERVAL = float(os.getenv('SUGGEST_REFRESH_INTERVAL', 10))
+SUGGEST_REBUILD_INTERVAL = float(os.getenv('SUGGEST_REBUILD_INTERVAL', 600))
+SUGGEST_MAX_EXPANSIONS = int(os.getenv('SUGGEST_MAX_EXPANSIONS', 200))
 
-# MongoDB Connection with error handling
-try:
-    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
-    client.server_info()  # Test connection
-    db = client[DATABASE_NAME]
+# MongoDB connection pool (pymongo defaults when unset or 0)
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 100))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 0))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 0)) or None
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 5000)) or None
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', 5000))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', 30000)) or None
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+# How often the driver re-checks an unreachable server, i.e. the recovery time after a Mongo restart
+MONGO_HEARTBEAT_FREQUENCY_MS = int(os.getenv('MONGO_HEARTBEAT_FREQUENCY_MS', 1000))
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool checkout and wait-time counters, reported on /health"""
     
-    # Collections
-    products_collection = db.products
-    categories_collection = db.categories
-    audit_collection = db.audit_logs
-    analytics_collection = db.analytics
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
     
-    # Create indexes for performance
-    products_collection.create_index([("name", "text"), ("description", "text"), ("tags", "text")])
-    products_collection.create_index([("category_id", ASCENDING)])
-    products_collection.create_index([("created_at", DESCENDING)])
-    products_collection.create_index([("price", ASCENDING)])
+    def reset(self):
+        with self._lock:
+            self.connections_created = 0
+            self.connections_closed = 0
+            self.checkouts = 0
+            self.checkout_failures = {}
+            self.checked_out = 0
+            self.max_checked_out = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.pool_clears = 0
     
-    audit_collection.create_index([("timestamp", DESCENDING)])
-    audit_collection.create_index([("action", ASCENDING)])
+    # Checkout events fire on the requesting thread, so the start time lives in a thread-local
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+    
+    def connection_checked_out(self, event):
+        waited = time.perf_counter() - getattr(self._local, 'started', time.perf_counter())
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+    
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures[event.reason] = self.checkout_failures.get(event.reason, 0) + 1
+    
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+    
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+    
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+    
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "max_pool_size": MONGO_MAX_POOL_SIZE,
+                "wait_queue_timeout_ms": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                "open_connections": self.connections_created - self.connections_closed,
+                "connections_created": self.connections_created,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": dict(self.checkout_failures),
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "pool_clears": self.pool_clears
+            }
+
+class MongoHealth(monitoring.TopologyListener):
+    """Connection state driven by the driver's server monitoring, so no request blocks on it"""
+    
+    def __init__(self, on_change=None):
+        self.on_change = on_change
+        self._connected = threading.Event()
+        self.reset()
+    
+    def reset(self):
+        self._connected.clear()
+        self.state = "connecting"
+        self.since = datetime.now(timezone.utc)
+        self.transitions = 0
+        self.last_error = None
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the server is reachable (for CLI commands and scripts, never for requests)"""
+        return self._connected.wait(timeout)
+    
+    def opened(self, event):
+        pass
+    
+    def closed(self, event):
+        pass
+    
+    def description_changed(self, event):
+        description = event.new_description
+        connected = description.has_writable_server()
+        errors = [server.error for server in description.server_descriptions().values() if server.error]
+        if errors:
+            self.last_error = str(errors[0])
+        
+        state = "connected" if connected else "disconnected"
+        if state == self.state or (state == "disconnected" and not errors):
+            return
+        self.state = state
+        self.since = datetime.now(timezone.utc)
+        self.transitions += 1
+        if connected:
+            self._connected.set()
+            print("✅ Connected to MongoDB successfully")
+        else:
+            self._connected.clear()
+            print(f"❌ MongoDB unavailable: {self.last_error}")
+        if self.on_change:
+            self.on_change(connected)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "since": self.since.isoformat(),
+            "transitions": self.transitions,
+            "last_error": self.last_error
+        }
+
+def _set_mongo_connected(connected: bool):
+    global mongo_connected
+    mongo_connected = connected
+
+pool_metrics = PoolMetrics()
+mongo_health = MongoHealth(on_change=_set_mongo_connected)
+mongo_connected = False
+_mongo_pid = None
+
+def mongo_client_options() -> Dict[str, Any]:
+    """MongoClient keyword arguments built from the pool tunables"""
+    return {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "heartbeatFrequencyMS": MONGO_HEARTBEAT_FREQUENCY_MS,
+        "event_listeners": [pool_metrics, mongo_health]
+    }
+
+def init_mongo():
+    """Create this process's MongoClient and collection handles.
+    
+    Construction does not wait for the server: the driver connects in the
+    background and mongo_health flips mongo_connected as it comes and goes.
+    MongoClient is not fork-safe, so WSGI workers call this again after fork
+    (see create_app and gunicorn.conf.py) instead of inheriting the parent's client.
+    Indexes are created by the migrate command, not here.
+    """
+    global client, db, mongo_connected, _mongo_pid
+    global products_collection, categories_collection, audit_collection, audit_read_collection
+    global analytics_collection, analytics_hourly_collection, analytics_daily_collection
+    global dashboard_collection, stats_collection, import_jobs_collection, versions_collection
+    global migrations_collection
     
-    print("✅ Connected to MongoDB successfully")
-    mongo_connected = True
+    print(f"🔗 Connecting to: {MONGO_URI}")
+    print(f"📊 Database: {DATABASE_NAME}")
     
-except Exception as e:
-    print(f"❌ MongoDB connection failed: {e}")
+    _mongo_pid = os.getpid()
+    pool_metrics.reset()
+    mongo_health.reset()
     mongo_connected = False
+    
+    client = MongoClient(MONGO_URI, **mongo_client_options())
+    db = client[DATABASE_NAME]
+    
+    # Collections
+    products_collection = db.products
+    categories_collection = db.categories
+    audit_collection = db.audit_logs
+    audit_read_collection = db.audit_read_counters
+    analytics_collection = db.analytics  # legacy $push documents, folded into daily rollups by compact-analytics
+    analytics_hourly_collection = db.analytics_hourly
+    analytics_daily_collection = db.analytics_daily
+    dashboard_collection = db.dashboard_snapshots
+    stats_collection = db.inventory_stats
+    import_jobs_collection = db.import_jobs
+    versions_collection = db.collection_versions
+    migrations_collection = db.schema_migrations
+
+init_mongo()
 
 # Enums for better data validation
 class ProductStatus(Enum):
@@ -74,42 +396,448 @@ class AuditAction(Enum):
     BULK_UPDATE = "bulk_update"
     BULK_DELETE = "bulk_delete"
 
+def parse_audit_policy(spec: str) -> Dict[AuditAction, float]:
+    """Parse an audit policy spec into a per-action sample rate (1.0 = always, 0.0 = off)"""
+    policy = {action: 1.0 for action in AuditAction}
+    for entry in filter(None, (part.strip() for part in spec.split(','))):
+        try:
+            name, mode = (token.strip().lower() for token in entry.split('=', 1))
+            action = AuditAction(name)
+            if mode == 'always':
+                policy[action] = 1.0
+            elif mode == 'off':
+                policy[action] = 0.0
+            else:
+                policy[action] = min(max(float(mode), 0.0), 1.0)
+        except ValueError:
+            print(f"Ignoring invalid audit policy entry: {entry}")
+    return policy
+
+audit_policy = parse_audit_policy(AUDIT_POLICY)
+
 # Data validation schemas
-@dataclass
-class ProductSchema:
-    name: str
-    description: str
-    category_id: str
-    price: float
-    quantity: int
-    tags: List[str]
-    status: str = ProductStatus.ACTIVE.value
-    
-    def validate(self) -> Dict[str, Any]:
-        errors = {}
-        
-        if not self.name or len(self.name.strip()) < 2:
-            errors['name'] = 'Name must be at least 2 characters long'
-            
-        if not self.description or len(self.description.strip()) < 10:
-            errors['description'] = 'Description must be at least 10 characters long'
-            
-        if self.price <= 0:
-            errors['price'] = 'Price must be greater than 0'
-            
-        if self.quantity < 0:
-            errors['quantity'] = 'Quantity cannot be negative'
+# Schemas are declared once and instantiated at import time; every product write path
+# (single, bulk, patch and file import) validates against the same compiled fields.
+PRODUCT_STATUSES = tuple(status.value for status in ProductStatus)
+
+class TrimmedString(fields.String):
+    """String field that strips surrounding whitespace before validators run"""
+    def _deserialize(self, value, attr, data, **kwargs):
+        return super()._deserialize(value, attr, data, **kwargs).strip()
+
+class TagList(fields.List):
+    """List of trimmed tags with blank entries dropped"""
+    def __init__(self, **kwargs):
+        super().__init__(TrimmedString(), **kwargs)
+    
+    def _deserialize(self, value, attr, data, **kwargs):
+        return [tag for tag in super()._deserialize(value, attr, data, **kwargs) if tag]
+
+class ObjectIdField(fields.Field):
+    """Hex string deserialized to an ObjectId"""
+    default_error_messages = {"invalid": "Invalid category ID"}
+    
+    def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, ObjectId):
+            return value
+        if not isinstance(value, str) or not ObjectId.is_valid(value):
+            raise self.make_error("invalid")
+        return ObjectId(value)
+
+REQUIRED_FIELD_ERROR = {"required": "Missing required field"}
+
+class ProductSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+    
+    name = TrimmedString(required=True, error_messages=REQUIRED_FIELD_ERROR,
+                         validate=validate.Length(min=2, error='Name must be at least 2 characters long'))
+    description = TrimmedString(required=True, error_messages=REQUIRED_FIELD_ERROR,
+                                validate=validate.Length(min=10, error='Description must be at least 10 characters long'))
+    category_id = ObjectIdField(required=True, error_messages=REQUIRED_FIELD_ERROR)
+    price = fields.Float(required=True, error_messages={**REQUIRED_FIELD_ERROR, "invalid": "Invalid price format"},
+                         validate=validate.Range(min=0, min_inclusive=False, error='Price must be greater than 0'))
+    quantity = fields.Integer(required=True, error_messages={**REQUIRED_FIELD_ERROR, "invalid": "Invalid quantity format"},
+                              validate=validate.Range(min=0, error='Quantity cannot be negative'))
+    tags = TagList(load_default=list)
+    status = fields.String(load_default=ProductStatus.ACTIVE.value,
+                           validate=validate.OneOf(PRODUCT_STATUSES, error='Invalid status'))
+
+product_schema = ProductSchema()
+product_update_schema = ProductSchema(partial=True)
+
+# Sentinel for a cell the compiled column path cannot settle; it goes through field.deserialize()
+_NEEDS_LOAD = object()
+_NUMBER_INPUT_TYPES = frozenset((str, int, float))
+
+def _compile_converter(field: fields.Field):
+    """Return an exact-type converter for the field, or None to run field.deserialize per cell"""
+    if isinstance(field, TagList) and type(field.inner) is TrimmedString and not field.inner.validators:
+        def convert(value):
+            if type(value) is not list:
+                return _NEEDS_LOAD
+            tags = []
+            for tag in value:
+                if type(tag) is not str:
+                    return _NEEDS_LOAD
+                tag = tag.strip()
+                if tag:
+                    tags.append(tag)
+            return tags
+        return convert
+    if isinstance(field, ObjectIdField):
+        # Import and bulk batches repeat a handful of category IDs; ObjectIds are immutable
+        parsed: Dict[str, ObjectId] = {}
+        def convert(value):
+            if type(value) is str:
+                oid = parsed.get(value)
+                if oid is not None:
+                    return oid
+                if len(value) == 24:
+                    try:
+                        oid = ObjectId(value)
+                    except InvalidId:
+                        return _NEEDS_LOAD
+                    if len(parsed) >= 1024:
+                        parsed.clear()
+                    parsed[value] = oid
+                    return oid
+            return _NEEDS_LOAD
+        return convert
+    if isinstance(field, TrimmedString):
+        return lambda value: value.strip() if type(value) is str else _NEEDS_LOAD
+    if type(field) is fields.String:
+        return lambda value: value if type(value) is str else _NEEDS_LOAD
+    if type(field) is fields.Float and not field.as_string:
+        allow_nan = field.allow_nan
+        def convert(value):
+            if type(value) in _NUMBER_INPUT_TYPES:
+                try:
+                    value = float(value)
+                except ValueError:
+                    return _NEEDS_LOAD
+                if allow_nan or math.isfinite(value):
+                    return value
+            return _NEEDS_LOAD
+        return convert
+    if type(field) is fields.Integer and not field.as_string:
+        strict = field.strict
+        def convert(value):
+            if type(value) is int:
+                return value
+            if type(value) is str and not strict:
+                try:
+                    return int(value)
+                except ValueError:
+                    pass
+            return _NEEDS_LOAD
+        return convert
+    return None
+
+def _compile_check(validator):
+    """Return a predicate equivalent to the validator passing"""
+    if isinstance(validator, validate.Length):
+        low, high, equal = validator.min, validator.max, validator.equal
+        if equal is not None:
+            return lambda value: len(value) == equal
+        if high is None:
+            return (lambda value: True) if low is None else (lambda value: len(value) >= low)
+        if low is None:
+            return lambda value: len(value) <= high
+        return lambda value: low <= len(value) <= high
+    if isinstance(validator, validate.Range):
+        low, high = validator.min, validator.max
+        low_inclusive, high_inclusive = validator.min_inclusive, validator.max_inclusive
+        if high is None:
+            if low is None:
+                return lambda value: True
+            return (lambda value: value >= low) if low_inclusive else (lambda value: value > low)
+        if low is None:
+            return (lambda value: value <= high) if high_inclusive else (lambda value: value < high)
+        return lambda value: ((value >= low) if low_inclusive else (value > low)) and \
+            ((value <= high) if high_inclusive else (value < high))
+    if isinstance(validator, validate.OneOf):
+        try:
+            return frozenset(validator.choices).__contains__
+        except TypeError:
+            pass
+    def check(value):
+        try:
+            return validator(value) is not False
+        except ValidationError:
+            return False
+    return check
+
+def _compile_column(field: fields.Field):
+    """Compile a field into a function returning (values, unsettled row indexes) for a column"""
+    convert = _compile_converter(field)
+    if convert is None:
+        def convert(value):
+            try:
+                return field.deserialize(value)
+            except ValidationError:
+                return _NEEDS_LOAD
+    checks = tuple(_compile_check(validator) for validator in field.validators)
+    
+    def run(column: List[Any]) -> tuple:
+        # Missing cells fail the exact-type converters too and take the deserialize() path,
+        # which fills in load defaults and required errors
+        loaded = list(map(convert, column))
+        for check in checks:
+            loaded = [value if value is _NEEDS_LOAD or check(value) else _NEEDS_LOAD for value in loaded]
+        return loaded, [index for index, value in enumerate(loaded) if value is _NEEDS_LOAD]
+    return run
+
+class ProductBatchValidator:
+    """Validate a batch of product payloads column by column against a compiled schema.
+    
+    Each field is compiled once into a column function: an exact-type conversion followed by
+    its Length/Range/OneOf checks, run down the whole column. Only cells the compiled path
+    cannot settle (other types, failed checks, missing required values) go through the
+    field's own deserialize() for their value or error messages, and non-dict rows through
+    Schema.load, so every row gets exactly Schema.load's result. Schema-level validators are
+    not run; ProductSchema declares none.
+    """
+    
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self.fields = [(name, field.data_key or name, field) for name, field in schema.load_fields.items()]
+        self.columns = [_compile_column(field) for _, _, field in self.fields]
+        # Only optional fields without a default can leave a key out of the loaded dict
+        self.sparse = any(not field.required and field.load_default is missing for _, _, field in self.fields)
+    
+    def validate(self, rows: List[Dict]) -> tuple:
+        """Return (values, errors): a field dict per valid row and {index: {field: [messages]}}"""
+        errors: Dict[int, Dict[str, Any]] = {}
+        invalid_type = {index for index, row in enumerate(rows) if type(row) is not dict}
+        columns = []
+        for (name, key, field), run in zip(self.fields, self.columns):
+            loaded, unsettled = run([missing if index in invalid_type else row.get(key, missing)
+                                     for index, row in enumerate(rows)] if invalid_type else
+                                    [row.get(key, missing) for row in rows])
+            for index in unsettled:
+                if index in invalid_type:
+                    continue
+                row = rows[index]
+                try:
+                    loaded[index] = field.deserialize(row.get(key, missing), key, row)
+                except ValidationError as e:
+                    errors.setdefault(index, {})[key] = e.messages
+            columns.append(loaded)
+        for index in invalid_type:
+            try:
+                self.schema.load(rows[index])
+            except ValidationError as e:
+                errors[index] = e.messages
+        
+        names = [name for name, _, _ in self.fields]
+        values: List[Optional[Dict]] = []
+        for index, loaded in enumerate(zip(*columns)):
+            if index in errors:
+                values.append(None)
+            elif self.sparse:
+                values.append({name: value for name, value in zip(names, loaded) if value is not missing})
+            else:
+                values.append(dict(zip(names, loaded)))
+        return values, errors
+
+product_batch_validator = ProductBatchValidator(product_schema)
+
+def product_document(values: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Build the product document stored in MongoDB from validated schema output"""
+    return {
+        **values,
+        "created_at": now,
+        "updated_at": now,
+        "views": 0,
+        "last_viewed": None,
+        "version": 0
+    }
+
+class BackgroundWorker:
+    """Base for objects that own one daemon thread running self._run.
+    
+    The thread is started on first use rather than at import, so that forked worker
+    processes each get their own.
+    """
+    
+    thread_name = "background-worker"
+    
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+    
+    def ensure_started(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if not (self._thread and self._thread.is_alive()):
+                self._before_start()
+                self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+                self._thread.start()
+    
+    def _before_start(self):
+        pass
+    
+    def _run(self):
+        raise NotImplementedError
+
+class AuditWriter(BackgroundWorker):
+    """Bounded audit queue drained by a background thread using batched insert_many"""
+    
+    thread_name = "audit-writer"
+    _STOP = object()
+    
+    def __init__(self, max_queue: int, batch_size: int, flush_interval: float,
+                 backpressure: str = 'drop', block_timeout: float = 5.0):
+        super().__init__()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.block_timeout = block_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.sampled_out = 0
+        self._read_counts: Dict[tuple, int] = {}
+        self._read_lock = threading.Lock()
+        self.read_counter_updates = 0
+    
+    def submit(self, audit_log: Dict):
+        """Queue an audit document, dropping or blocking when the queue is full"""
+        self.ensure_started()
+        try:
+            if self.backpressure == 'block':
+                self._queue.put(audit_log, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(audit_log)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+    
+    def count_read(self, resource_type: str):
+        """Aggregate a READ into the per-minute counter for its resource type"""
+        self.ensure_started()
+        minute = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        with self._read_lock:
+            key = (minute, resource_type)
+            self._read_counts[key] = self._read_counts.get(key, 0) + 1
+    
+    def _flush_read_counts(self):
+        with self._read_lock:
+            counts, self._read_counts = self._read_counts, {}
+        if not counts:
+            return
+        try:
+            audit_read_collection.bulk_write([
+                UpdateOne(
+                    {"minute": minute, "resource_type": resource_type},
+                    {"$inc": {"count": count}},
+                    upsert=True
+                )
+                for (minute, resource_type), count in counts.items()
+            ], ordered=False)
+            self.read_counter_updates += len(counts)
+        except Exception as e:
+            print(f"Audit read counter flush failed: {e}")
+    
+    def _write(self, batch: List[Dict]):
+        if not batch:
+            return
+        try:
+            audit_collection.insert_many(batch, ordered=False)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"Audit batch write failed: {e}")
+        self.batches += 1
+        self.last_batch_size = len(batch)
+    
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
             
-        if self.status not in [status.value for status in ProductStatus]:
-            errors['status'] = 'Invalid status'
+            if item is self._STOP:
+                self._write(batch)
+                self._flush_read_counts()
+                return
+            if item is not None:
+                batch.append(item)
             
-        return errors
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                self._write(batch)
+                self._flush_read_counts()
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+    
+    def stop(self, timeout: float = 10.0):
+        """Flush what can be written within timeout, drop the rest and stop the worker thread"""
+        if not (self._thread and self._thread.is_alive()):
+            return
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(self._STOP, timeout=timeout / 2)
+        except queue.Full:
+            # The writer is stuck (e.g. MongoDB is down); drop the backlog rather than outlive graceful_timeout
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.dropped += 1
+            try:
+                self._queue.put_nowait(self._STOP)
+            except queue.Full:
+                pass
+        self._thread.join(max(0, deadline - time.monotonic()))
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "backpressure": self.backpressure,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "avg_batch_size": round(self.written / self.batches, 2) if self.batches else 0.0,
+            "sampled_out": self.sampled_out,
+            "read_counter_updates": self.read_counter_updates,
+            "policy": {action.value: rate for action, rate in audit_policy.items()}
+        }
+
+audit_writer = AuditWriter(AUDIT_QUEUE_SIZE, AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL,
+                           AUDIT_BACKPRESSURE, AUDIT_BLOCK_TIMEOUT)
+atexit.register(audit_writer.stop)
 
 def log_audit(action: AuditAction, resource_type: str, resource_id: str = None, 
-              details: Dict = None, user_ip: str = None):
-    """Log all database operations for audit trail"""
+              details: Dict = None, user_ip: str = None, user_agent: str = None):
+    """Log all database operations for audit trail (written asynchronously in batches)"""
     if not mongo_connected:
         return
+    
+    # READs are counted per minute; individual documents follow the sampling policy
+    if action == AuditAction.READ and AUDIT_READ_AGGREGATE:
+        audit_writer.count_read(resource_type)
+    
+    sample_rate = audit_policy.get(action, 1.0)
+    if sample_rate < 1.0 and (sample_rate <= 0.0 or random.random() >= sample_rate):
+        audit_writer.sampled_out += 1
+        return
         
     try:
         audit_log = {
@@ -118,33 +846,1239 @@ def log_audit(action: AuditAction, resource_type: str, resource_id: str = None,
             "resource_type": resource_type,
             "resource_id": resource_id,
             "details": details or {},
-            "user_ip": user_ip or request.remote_addr,
-            "user_agent": request.headers.get('User-Agent', '')
+            "user_ip": user_ip or (request.remote_addr if has_request_context() else None),
+            "user_agent": user_agent or (request.headers.get('User-Agent', '') if has_request_context() else '')
         }
-        audit_collection.insert_one(audit_log)
+        audit_writer.submit(audit_log)
     except Exception as e:
         print(f"Audit logging failed: {e}")
 
+def price_bucket(price: float) -> str:
+    """Map a price onto one of the fixed histogram buckets"""
+    for lower, upper in zip(ANALYTICS_PRICE_BUCKETS, ANALYTICS_PRICE_BUCKETS[1:]):
+        if price < upper:
+            return f"{lower}-{upper}"
+    return f"{ANALYTICS_PRICE_BUCKETS[-1]}+"
+
+def build_rollup_update(data: Dict, now: datetime) -> Dict:
+    """Translate an analytics event into fixed-size counter and histogram updates"""
+    inc = {"count": 1}
+    update = {"$inc": inc, "$set": {"last_updated": now}}
+    data = data or {}
+    
+    if "count" in data:
+        inc["items"] = data["count"]
+    
+    if "price" in data:
+        bucket = price_bucket(data["price"])
+        inc["price_sum"] = data["price"]
+        inc[f"price_buckets.{bucket}"] = 1
+        update["$min"] = {"price_min": data["price"]}
+        update["$max"] = {"price_max": data["price"]}
+    
+    if "category_id" in data:
+        prefix = f"by_category.{data['category_id']}"
+        inc[f"{prefix}.count"] = 1
+        update["$set"][f"{prefix}.name"] = data.get("category")
+        if "price" in data:
+            inc[f"{prefix}.price_sum"] = data["price"]
+            inc[f"{prefix}.price_buckets.{price_bucket(data['price'])}"] = 1
+    
+    return update
+
 def update_analytics(action: str, data: Dict = None):
-    """Update analytics data for dashboard"""
+    """Update hourly analytics rollups for dashboard"""
     if not mongo_connected:
         return
         
     try:
         now = datetime.now(timezone.utc)
-        today_str = now.strftime("%Y-%m-%d")  # Use string instead of date object
-        analytics_collection.update_one(
-            {"date": today_str, "action": action},
-            {
-                "$inc": {"count": 1},
-                "$set": {"last_updated": now},
-                "$push": {"data": data} if data else {}
-            },
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        analytics_hourly_collection.update_one(
+            {"action": action, "bucket": hour},
+            build_rollup_update(data, now),
             upsert=True
         )
     except Exception as e:
         print(f"Analytics update failed: {e}")
 
+def _merge_rollup(target: Dict, document: Dict, prefix: str = ''):
+    """Fold one rollup document's counters into a pending $inc/$min/$max/$set update"""
+    for key, value in document.items():
+        if not prefix and key in ('_id', 'action', 'bucket'):
+            continue
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            _merge_rollup(target, value, path + '.')
+        elif key == 'price_min':
+            current = target["$min"].get(path)
+            target["$min"][path] = value if current is None else min(current, value)
+        elif key in ('price_max', 'last_updated'):
+            current = target["$max"].get(path)
+            target["$max"][path] = value if current is None else max(current, value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            target["$inc"][path] = target["$inc"].get(path, 0) + value
+        else:
+            target["$set"][path] = value
+
+def legacy_rollup_update(document: Dict) -> Dict:
+    """Fold a legacy $push analytics document and its event array into one daily rollup update"""
+    target = {"$inc": {}, "$min": {}, "$max": {}, "$set": {}}
+    for event in document.get('data') or []:
+        update = build_rollup_update(event, document.get('last_updated'))
+        for path, value in update["$inc"].items():
+            target["$inc"][path] = target["$inc"].get(path, 0) + value
+        for path, value in update.get("$min", {}).items():
+            target["$min"][path] = min(target["$min"].get(path, value), value)
+        for path, value in update.get("$max", {}).items():
+            target["$max"][path] = max(target["$max"].get(path, value), value)
+        target["$set"].update((path, value) for path, value in update["$set"].items() if path != 'last_updated')
+    # Events without data were counted but never pushed, so the stored count is authoritative
+    target["$inc"]["count"] = document.get('count', 0)
+    if document.get('last_updated'):
+        target["$max"]["last_updated"] = document['last_updated']
+    return {operator: fields for operator, fields in target.items() if fields}
+
+def compact_analytics(now: datetime = None, batch_size: int = 1000) -> Dict[str, int]:
+    """Roll expired hourly buckets into daily buckets and fold legacy $push documents into them"""
+    now = now or datetime.now(timezone.utc)
+    cutoff = (now - timedelta(days=ANALYTICS_HOURLY_RETENTION_DAYS)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    stats = {"hourly_compacted": 0, "daily_updated": 0, "legacy_folded": 0}
+    
+    while True:
+        hourly = list(analytics_hourly_collection.find({"bucket": {"$lt": cutoff}}).sort("bucket", 1).limit(batch_size))
+        if not hourly:
+            break
+        
+        daily_updates: Dict[tuple, Dict] = {}
+        for document in hourly:
+            day = document['bucket'].replace(hour=0, minute=0, second=0, microsecond=0)
+            target = daily_updates.setdefault(
+                (document['action'], day), {"$inc": {}, "$min": {}, "$max": {}, "$set": {}}
+            )
+            _merge_rollup(target, document)
+        
+        analytics_daily_collection.bulk_write([
+            UpdateOne(
+                {"action": action, "bucket": day},
+                {operator: fields for operator, fields in update.items() if fields},
+                upsert=True
+            )
+            for (action, day), update in daily_updates.items()
+        ], ordered=False)
+        analytics_hourly_collection.delete_many({"_id": {"$in": [document['_id'] for document in hourly]}})
+        
+        stats["hourly_compacted"] += len(hourly)
+        stats["daily_updated"] += len(daily_updates)
+    
+    # Fold the unbounded arrays left behind by the old $push analytics format into daily
+    # rollups, then drop each folded document so a re-run cannot count it twice
+    while True:
+        legacy = list(analytics_collection.find({"date": {"$type": "string"}}).limit(batch_size))
+        if not legacy:
+            break
+        analytics_daily_collection.bulk_write([
+            UpdateOne(
+                {"action": document['action'],
+                 "bucket": datetime.strptime(document['date'], "%Y-%m-%d").replace(tzinfo=timezone.utc)},
+                legacy_rollup_update(document),
+                upsert=True
+            )
+            for document in legacy
+        ], ordered=False)
+        analytics_collection.delete_many({"_id": {"$in": [document['_id'] for document in legacy]}})
+        stats["legacy_folded"] += len(legacy)
+    
+    return stats
+
+# Category embedding shared by all product responses
+CATEGORY_SUMMARY_PROJECTION = {"name": 1, "color": 1, "icon": 1}
+
+class CategoryCache:
+    """Read-through category cache keyed by ObjectId with TTL and LRU eviction"""
+    
+    def __init__(self, ttl_seconds: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[ObjectId, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def lookup(self, category_ids) -> tuple:
+        """Split ids into (cached categories, ids that must be loaded) without querying"""
+        found = {}
+        missing = []
+        now = time.monotonic()
+        
+        with self._lock:
+            for category_id in set(category_ids):
+                entry = self._entries.get(category_id)
+                if entry and entry[0] > now:
+                    self._entries.move_to_end(category_id)
+                    found[category_id] = entry[1]
+                    self.hits += 1
+                else:
+                    missing.append(category_id)
+                    self.misses += 1
+        return found, missing
+    
+    def store(self, categories: List[Dict]) -> Dict[ObjectId, Dict]:
+        """Cache freshly loaded categories and return them keyed by id"""
+        stored = {}
+        with self._lock:
+            expires_at = time.monotonic() + self.ttl_seconds
+            for category in categories:
+                self._entries[category['_id']] = (expires_at, category)
+                self._entries.move_to_end(category['_id'])
+                stored[category['_id']] = category
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return stored
+    
+    def get_many(self, category_ids) -> Dict[ObjectId, Dict]:
+        """Return cached categories, loading all misses with a single $in query"""
+        found, missing = self.lookup(category_ids)
+        if missing:
+            found.update(self.store(categories_collection.find({"_id": {"$in": missing}}, CATEGORY_SUMMARY_PROJECTION)))
+        return found
+    
+    def get(self, category_id: ObjectId) -> Optional[Dict]:
+        """Return a single category or None if it does not exist"""
+        return self.get_many([category_id]).get(category_id)
+    
+    def invalidate(self, category_id: ObjectId = None):
+        """Drop one category, or the whole cache when no id is given"""
+        with self._lock:
+            if category_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(category_id, None)
+            self.invalidations += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+category_cache = CategoryCache(CATEGORY_CACHE_TTL, CATEGORY_CACHE_SIZE)
+
+def watch_category_changes():
+    """Keep the category cache coherent across processes via a change stream (replica set only)"""
+    while True:
+        try:
+            with categories_collection.watch() as stream:
+                for change in stream:
+                    category_id = change.get('documentKey', {}).get('_id')
+                    category_cache.invalidate(category_id)
+        except Exception as e:
+            print(f"Category change stream failed: {e}")
+            category_cache.invalidate()
+            time.sleep(5)
+
+_category_watch_pid = None
+
+def start_category_watch():
+    """Start the change-stream watcher once per process (threads do not survive fork)"""
+    global _category_watch_pid
+    if CATEGORY_CACHE_WATCH and _category_watch_pid != os.getpid():
+        _category_watch_pid = os.getpid()
+        threading.Thread(target=watch_category_changes, name="category-watch", daemon=True).start()
+
+start_category_watch()
+
+def category_summary(category: Dict) -> Dict:
+    """Build the category sub-document embedded in product responses"""
+    return {
+        "_id": category['_id'],
+        "name": category['name'],
+        "color": category.get('color', '#007bff'),
+        "icon": category.get('icon', 'fas fa-box')
+    }
+
+def embed_categories(products: List[Dict], known_categories: Dict[ObjectId, Dict] = None) -> List[Dict]:
+    """Attach category info to products using one batched $in lookup"""
+    categories = dict(known_categories or {})
+    missing_ids = {
+        product['category_id'] for product in products
+        if product.get('category_id') is not None and product['category_id'] not in categories
+    }
+    
+    if missing_ids:
+        categories.update(category_cache.get_many(missing_ids))
+    
+    for product in products:
+        category = categories.get(product.get('category_id'))
+        if category:
+            product['category'] = category_summary(category)
+            
+    return products
+
+def build_product_update(data: Dict) -> tuple:
+    """Validate a partial product update; returns (update_data, None) or (None, (error_body, status_code))"""
+    try:
+        update_data = product_update_schema.load(data)
+    except ValidationError as e:
+        return None, ({"error": "Validation failed", "details": e.messages}, 400)
+    
+    if 'category_id' in update_data and not category_cache.get(update_data['category_id']):
+        return None, ({"error": "Category not found"}, 404)
+    
+    update_data['updated_at'] = datetime.now(timezone.utc)
+    return update_data, None
+
+def validate_product_batch(rows: List[Dict], now: datetime, categories: Dict[ObjectId, Dict] = None) -> tuple:
+    """Validate product payloads column-wise; returns ([(index, document)], [(index, errors)])"""
+    values, errors = product_batch_validator.validate(rows)
+    
+    # Resolve every referenced category with one batched lookup unless the caller already did
+    if categories is None:
+        categories = category_cache.get_many({value['category_id'] for value in values if value})
+    
+    documents = []
+    for index, value in enumerate(values):
+        if value is None:
+            continue
+        if value['category_id'] not in categories:
+            errors[index] = {"category_id": ["Category not found"]}
+            continue
+        documents.append((index, product_document(value, now)))
+    return documents, sorted(errors.items())
+
+# Optimistic concurrency via the product version field
+def parse_if_match() -> tuple:
+    """Return (expected_version, None) from If-Match, or (None, error_response).
+    
+    If-Match uses strong comparison (RFC 9110), so weak validators fail with 412. Only the
+    version component of a product ETag is compared: view counts and category edits do not
+    conflict with a write. A missing header or '*' yields no expected version.
+    """
+    value = request.headers.get('If-Match', '').strip()
+    if not value or value == '*':
+        return None, None
+    if value.startswith('W/'):
+        return None, (jsonify({"error": "If-Match requires a strong ETag", "status": 412}), 412)
+    try:
+        return int(value.strip('"').split('.')[0]), None
+    except ValueError:
+        return None, (jsonify({"error": "Invalid If-Match header"}), 400)
+
+def version_filter(product_id: ObjectId, expected_version: Optional[int]) -> Dict:
+    """Match a product, optionally only at the expected version (missing version counts as 0)"""
+    query = {"_id": product_id}
+    if expected_version is not None:
+        query["version"] = {"$in": [0, None]} if expected_version == 0 else expected_version
+    return query
+
+def version_etag(product: Dict, categories_version: int) -> str:
+    """Strong ETag value (unquoted) for a product body: version, flushed views and category generation"""
+    # Views and the embedded category change without bumping the version, so they are part of the validator
+    return f"{product.get('version', 0)}.{product.get('views') or 0}.{categories_version}"
+
+def product_last_modified(product: Dict, categories_updated: Optional[datetime]) -> Optional[datetime]:
+    """Latest of the product's own edits, its last flushed view and category changes"""
+    # Documents read back from MongoDB carry naive UTC datetimes
+    return latest(
+        *(product[field].replace(tzinfo=timezone.utc) for field in ('updated_at', 'last_viewed') if product.get(field)),
+        categories_updated
+    )
+
+def write_miss_response(product_id: ObjectId, expected_version: Optional[int]):
+    """Explain why an atomic write matched nothing: missing product or stale version"""
+    if expected_version is not None and products_collection.find_one({"_id": product_id}, {"_id": 1}):
+        return jsonify({"error": "Product was modified by another request", "status": 412}), 412
+    return jsonify({"error": "Product not found"}), 404
+
+# Keyset pagination helpers for product listings
+COUNT_MODES = ('exact', 'estimated', 'capped', 'none')
+# Each has a (field, _id) index so sorted pages never need an in-memory SORT stage
+SORTABLE_FIELDS = ('created_at', 'price', 'views')
+
+def encode_cursor(document: Dict, sort_by: str, sort_order: str) -> str:
+    """Build an opaque cursor pointing just past the given document"""
+    payload = json_util.dumps({
+        "s": sort_by,
+        "o": sort_order,
+        "v": document.get(sort_by),
+        "id": document['_id']
+    })
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(token: str, sort_by: str, sort_order: str) -> Dict:
+    """Decode a cursor, rejecting tampered tokens or ones issued for another sort"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        cursor = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if cursor.get('s') != sort_by or cursor.get('o') != sort_order or not isinstance(cursor.get('id'), ObjectId):
+        raise ValueError("Cursor does not match the requested sort")
+    return cursor
+
+def keyset_filter(cursor: Dict, sort_by: str, sort_direction: int) -> List[Dict]:
+    """Match documents strictly after the cursor in (sort_by, _id) order"""
+    operator = "$lt" if sort_direction == DESCENDING else "$gt"
+    # Null and missing values sort before every other value, and range operators never match them
+    if cursor['v'] is None:
+        after = [{sort_by: None, "_id": {operator: cursor['id']}}]
+        if sort_direction == ASCENDING:
+            after.append({sort_by: {"$ne": None}})
+        return after
+    after = [
+        {sort_by: {operator: cursor['v']}},
+        {sort_by: cursor['v'], "_id": {operator: cursor['id']}}
+    ]
+    if sort_direction == DESCENDING:
+        after.append({sort_by: None})
+    return after
+
+def count_products(query: Dict, mode: str) -> tuple:
+    """Return (total_count, is_exact) for the requested count mode"""
+    if mode == 'none':
+        return None, False
+    if mode == 'estimated' and not query:
+        return products_collection.estimated_document_count(), False
+    if mode in ('estimated', 'capped'):
+        # Filtered estimates fall back to a count that stops scanning at the cap
+        count = products_collection.count_documents(query, limit=PRODUCT_COUNT_CAP)
+        return count, count < PRODUCT_COUNT_CAP
+    return products_collection.count_documents(query), True
+
+# Query planner instrumentation and index advisor for product listings
+def query_shape(query: Dict, sort_field: List[tuple]) -> Dict[str, Any]:
+    """Reduce a product query to the fields it filters and sorts on, ignoring values"""
+    equality, ranges = [], []
+    for field, condition in query.items():
+        if field.startswith('$'):
+            continue  # $text and keyset $or clauses
+        if isinstance(condition, dict) and any(key.startswith('$') for key in condition):
+            ranges.append(field)
+        else:
+            equality.append(field)
+    return {
+        "equality": sorted(equality),
+        "sort": [[field, direction] for field, direction in sort_field],
+        "range": sorted(ranges),
+        "text": "$text" in query
+    }
+
+def explain_summary(explain: Dict) -> Dict[str, Any]:
+    """Pull the winning plan's stages and examined counts out of explain() output"""
+    plan = explain.get('queryPlanner', {}).get('winningPlan', {})
+    plan = plan.get('queryPlan', plan)  # slot-based engine nests the classic tree
+    stages, indexes, pending = [], [], [plan]
+    while pending:
+        node = pending.pop()
+        stages.append(node.get('stage'))
+        if node.get('indexName'):
+            indexes.append(node['indexName'])
+        for key in ('inputStage', 'outerStage', 'innerStage'):
+            if key in node:
+                pending.append(node[key])
+        pending.extend(node.get('inputStages', []))
+    
+    execution = explain.get('executionStats', {})
+    return {
+        "keys_examined": execution.get('totalKeysExamined', 0),
+        "docs_examined": execution.get('totalDocsExamined', 0),
+        "returned": execution.get('nReturned', 0),
+        "millis": execution.get('executionTimeMillis', 0),
+        "sort_stage": 'SORT' in stages,
+        "collection_scan": 'COLLSCAN' in stages,
+        "indexes": sorted(set(indexes))
+    }
+
+def recommend_index(shape: Dict) -> Optional[List[tuple]]:
+    """Compound index for a shape following the equality, sort, range rule"""
+    if shape['text']:
+        return None  # $text queries are served by the text index
+    keys = [(field, ASCENDING) for field in shape['equality']]
+    keys += [(field, direction) for field, direction in shape['sort']]
+    sorted_fields = {field for field, _ in keys}
+    keys += [(field, ASCENDING) for field in shape['range'] if field not in sorted_fields]
+    return keys
+
+def index_covers(index_keys: List[tuple], wanted: List[tuple]) -> bool:
+    """Whether an existing index has the wanted keys as a prefix (in either scan direction)"""
+    prefix = [(field, int(direction)) for field, direction in index_keys[:len(wanted)] if direction in (1, -1)]
+    if len(prefix) < len(wanted):
+        return False
+    return prefix == wanted or prefix == [(field, -direction) for field, direction in wanted]
+
+class QueryPlanner:
+    """Samples product list queries, explains each distinct shape in the background and aggregates the plans"""
+    
+    def __init__(self, sample_rate: float, explain_interval: float, max_shapes: int):
+        self.sample_rate = sample_rate
+        self.explain_interval = explain_interval
+        self.max_shapes = max_shapes
+        self._shapes: Dict[str, Dict] = {}
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-explain")
+        self.explains = 0
+        self.failed = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+    
+    def observe(self, query: Dict, sort_field: List[tuple], skip: int, limit: int):
+        """Queue an explain() for this query unless its shape was explained recently"""
+        if not self.enabled or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            return
+        shape = query_shape(query, sort_field)
+        key = json.dumps(shape, sort_keys=True)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._shapes.get(key)
+            if key in self._inflight or (entry and now - entry['explained_at'] < self.explain_interval):
+                return
+            if entry is None and len(self._shapes) >= self.max_shapes:
+                return
+            self._inflight.add(key)
+        self._executor.submit(self._explain, key, shape, query, sort_field, skip, limit)
+    
+    def _explain(self, key: str, shape: Dict, query: Dict, sort_field: List[tuple], skip: int, limit: int):
+        try:
+            summary = explain_summary(products_collection.find(query).sort(sort_field).skip(skip).limit(limit).explain())
+            with self._lock:
+                entry = self._shapes.setdefault(key, {
+                    "shape": shape, "samples": 0, "keys_examined": 0, "docs_examined": 0, "returned": 0,
+                    "millis": 0, "sort_stage": 0, "collection_scan": 0, "indexes": set()
+                })
+                entry["samples"] += 1
+                for field in ("keys_examined", "docs_examined", "returned", "millis"):
+                    entry[field] += summary[field]
+                entry["sort_stage"] += summary["sort_stage"]
+                entry["collection_scan"] += summary["collection_scan"]
+                entry["indexes"].update(summary["indexes"])
+                entry["explained_at"] = time.monotonic()
+                self.explains += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"Query explain failed: {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard(key)
+    
+    def reset(self):
+        with self._lock:
+            self._shapes.clear()
+    
+    def report(self, existing_indexes: List[List[tuple]]) -> Dict[str, Any]:
+        """Per-shape averages plus compound index suggestions for shapes with poor plans"""
+        with self._lock:
+            entries = [dict(entry, indexes=sorted(entry["indexes"])) for entry in self._shapes.values()]
+        
+        shapes, suggestions = [], {}
+        for entry in entries:
+            samples = entry["samples"]
+            row = {
+                "shape": entry["shape"],
+                "samples": samples,
+                "avg_keys_examined": round(entry["keys_examined"] / samples, 1),
+                "avg_docs_examined": round(entry["docs_examined"] / samples, 1),
+                "avg_returned": round(entry["returned"] / samples, 1),
+                "avg_millis": round(entry["millis"] / samples, 1),
+                "sort_stage": entry["sort_stage"] > 0,
+                "collection_scan": entry["collection_scan"] > 0,
+                "indexes": entry["indexes"]
+            }
+            shapes.append(row)
+            
+            # Ideal plans examine about as many documents as they return, without sorting in memory
+            inefficient = row["sort_stage"] or row["collection_scan"] or row["avg_docs_examined"] > 2 * max(row["avg_returned"], 1)
+            keys = recommend_index(entry["shape"]) if inefficient else None
+            if not keys or any(index_covers(index_keys, keys) for index_keys in existing_indexes):
+                continue
+            suggestion = suggestions.setdefault(json.dumps(keys), {"keys": [[field, direction] for field, direction in keys], "shapes": 0, "avg_docs_examined": 0})
+            suggestion["shapes"] += 1
+            suggestion["avg_docs_examined"] = max(suggestion["avg_docs_examined"], row["avg_docs_examined"])
+        
+        shapes.sort(key=lambda row: row["avg_docs_examined"], reverse=True)
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "explains": self.explains,
+            "failed": self.failed,
+            "shapes": shapes,
+            "suggestions": sorted(suggestions.values(), key=lambda item: item["avg_docs_examined"], reverse=True)
+        }
+
+query_planner = QueryPlanner(QUERY_PLANNER_SAMPLE_RATE, QUERY_PLANNER_EXPLAIN_INTERVAL, QUERY_PLANNER_MAX_SHAPES)
+
+# Collection version counters and HTTP conditional request helpers
+class CollectionVersions:
+    """Per-collection change counters shared through MongoDB and cached briefly in-process"""
+    
+    def __init__(self, cache_ttl: float):
+        self.cache_ttl = cache_ttl
+        self._versions: Dict[str, tuple] = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+    
+    def bump(self, name: str):
+        """Record that a collection changed (call after every write to it)"""
+        now = datetime.now(timezone.utc)
+        try:
+            document = versions_collection.find_one_and_update(
+                {"_id": name},
+                {"$inc": {"version": 1}, "$set": {"updated_at": now}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            self.record(name, document['version'], now)
+        except Exception as e:
+            print(f"Collection version bump failed: {e}")
+    
+    def record(self, name: str, version: int, updated_at: Optional[datetime]):
+        """Remember a version unless a newer one is already known"""
+        if updated_at and updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        with self._lock:
+            if version >= self._versions.get(name, (0, None))[0]:
+                self._versions[name] = (version, updated_at)
+    
+    def is_stale(self) -> bool:
+        return time.monotonic() - self._fetched_at > self.cache_ttl
+    
+    def merge(self, documents):
+        """Fold a full read of the versions collection into the cache"""
+        for document in documents:
+            self.record(document['_id'], document['version'], document.get('updated_at'))
+        self._fetched_at = time.monotonic()
+    
+    def cached(self, name: str) -> tuple:
+        with self._lock:
+            return self._versions.get(name, (0, None))
+    
+    def get(self, name: str) -> tuple:
+        """Return (version, updated_at); other workers' bumps become visible within cache_ttl"""
+        if self.is_stale():
+            try:
+                self.merge(versions_collection.find({}))
+            except Exception as e:
+                print(f"Collection version refresh failed: {e}")
+        return self.cached(name)
+
+collection_versions = CollectionVersions(VERSION_CACHE_TTL)
+
+def not_modified_response(etag: str, last_modified: Optional[datetime], policy: str, weak: bool = True):
+    """Return a 304 response when the request's validators still match, else None"""
+    if request.if_none_match:
+        matches = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified:
+        matches = last_modified.replace(microsecond=0) <= request.if_modified_since
+    else:
+        matches = False
+    
+    if not matches:
+        return None
+    return with_cache_headers(Response(status=304), etag, last_modified, policy, weak)
+
+def with_cache_headers(response, etag: str, last_modified: Optional[datetime], policy: str, weak: bool = True):
+    """Attach ETag, Last-Modified and Cache-Control headers to a response"""
+    response.set_etag(etag, weak=weak)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = CACHE_CONTROL.get(policy, 'no-cache')
+    return response
+
+def latest(*timestamps: Optional[datetime]) -> Optional[datetime]:
+    """Most recent of the given timestamps, ignoring missing ones"""
+    present = [timestamp for timestamp in timestamps if timestamp]
+    return max(present) if present else None
+
+# Shared response cache for product list queries
+class RedisCacheBackend:
+    """Second cache tier on a Redis-compatible server, shared by all workers"""
+    
+    name = "redis"
+    
+    def __init__(self, url: str, ttl_seconds: int):
+        if redis is None:
+            raise RuntimeError("The redis package is required for RESPONSE_CACHE_REDIS_URL")
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+    
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(f"crud:response:{key}")
+    
+    def set(self, key: str, body: bytes):
+        self.client.set(f"crud:response:{key}", body, ex=self.ttl_seconds)
+
+class ResponseCache:
+    """Serialized-response cache: in-process LRU tier with TTL plus an optional pluggable shared tier"""
+    
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: int, backend=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                # Expired: same lifetime as the shared tier, so nothing outlives a missed invalidation for long
+                self._bytes -= len(self._entries.pop(key)[1])
+        
+        if self.backend:
+            try:
+                body = self.backend.get(key)
+            except Exception as e:
+                print(f"Response cache backend read failed: {e}")
+                body = None
+            if body is not None:
+                self.backend_hits += 1
+                self._store_local(key, body)
+                return body
+        
+        self.misses += 1
+        return None
+    
+    def set(self, key: str, body: bytes):
+        self._store_local(key, body)
+        if self.backend:
+            try:
+                self.backend.set(key, body)
+            except Exception as e:
+                print(f"Response cache backend write failed: {e}")
+    
+    def _store_local(self, key: str, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key)[1])
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, body)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.backend_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "backend": self.backend.name if self.backend else None,
+                "hits": self.hits,
+                "backend_hits": self.backend_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.backend_hits) / lookups, 4) if lookups else 0.0
+            }
+
+response_cache = ResponseCache(
+    RESPONSE_CACHE_ENTRIES,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_TTL,
+    RedisCacheBackend(RESPONSE_CACHE_REDIS_URL, RESPONSE_CACHE_TTL) if RESPONSE_CACHE_REDIS_URL else None
+)
+
+def list_cache_key(kind: str, params: List) -> tuple:
+    """Identify a product listing page: (normalized_params, etag, cache_key, last_modified)"""
+    normalized_params = json.dumps(params)
+    query_hash = hashlib.sha1(normalized_params.encode()).hexdigest()[:16]
+    
+    # Any product or category write, or a view count flush, changes the generation of every page
+    products_version, products_updated = collection_versions.get('products')
+    categories_version, categories_updated = collection_versions.get('categories')
+    views_version, views_updated = collection_versions.get('views')
+    generation = f"{products_version}-{categories_version}-{views_version}"
+    return (
+        normalized_params,
+        f"{kind}-{generation}-{query_hash}",
+        f"{kind}:{generation}:{query_hash}",
+        latest(products_updated, categories_updated, views_updated)
+    )
+
+# Buffered product view counter
+class ViewCounter(BackgroundWorker):
+    """Accumulates product views in memory and flushes them as one unordered bulk_write"""
+    
+    thread_name = "view-counter"
+    
+    def __init__(self, flush_interval: float):
+        super().__init__()
+        self.flush_interval = flush_interval
+        self._pending: Dict[ObjectId, list] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.recorded = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.failed = 0
+    
+    def _before_start(self):
+        self._stop.clear()
+    
+    def record(self, product_id: ObjectId):
+        """Count one view of a product"""
+        self.ensure_started()
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._pending.setdefault(product_id, [0, now])
+            entry[0] += 1
+            entry[1] = now
+            self.recorded += 1
+    
+    def flush(self):
+        """Write all pending view counts with $inc/$max in a single round trip"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            products_collection.bulk_write([
+                UpdateOne(
+                    {"_id": product_id},
+                    {"$inc": {"views": count}, "$max": {"last_viewed": last_viewed}}
+                )
+                for product_id, (count, last_viewed) in pending.items()
+            ], ordered=False)
+            self.flushed += sum(count for count, _ in pending.values())
+            # List pages carry view counts, so flushed views start a new list generation
+            collection_versions.bump('views')
+            # Keep the dashboard's top viewed panel within one flush window of reality
+            mark_dashboard_dirty()
+        except Exception as e:
+            self.failed += sum(count for count, _ in pending.values())
+            print(f"View count flush failed: {e}")
+        self.flushes += 1
+    
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+    
+    def stop(self):
+        """Stop the flush thread and write whatever is still pending"""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(self.flush_interval + 1)
+        self.flush()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending_products = len(self._pending)
+            pending_views = sum(count for count, _ in self._pending.values())
+        return {
+            "flush_interval": self.flush_interval,
+            "pending_products": pending_products,
+            "pending_views": pending_views,
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "flushes": self.flushes
+        }
+
+view_counter = ViewCounter(VIEW_FLUSH_INTERVAL)
+atexit.register(view_counter.stop)
+
+# Inventory counters maintained incrementally on every product write
+INVENTORY_PROJECTION = {"name": 1, "price": 1, "quantity": 1, "status": 1, "category_id": 1}
+
+def inventory_delta(product: Dict, sign: int = 1) -> Dict[str, float]:
+    """Counter increments contributed by one product (sign=-1 removes it)"""
+    price = product.get('price', 0)
+    value = price * product.get('quantity', 0)
+    category_key = f"by_category.{product.get('category_id')}"
+    return {
+        "total_products": sign,
+        "active_products": sign if product.get('status') == ProductStatus.ACTIVE.value else 0,
+        "total_inventory_value": sign * value,
+        "price_sum": sign * price,
+        f"{category_key}.count": sign,
+        f"{category_key}.total_value": sign * value,
+        f"by_status.{product.get('status')}": sign
+    }
+
+def apply_inventory_deltas(*deltas: Dict[str, float]):
+    """Merge deltas and apply them to the stats document with a single $inc"""
+    if not mongo_connected:
+        return
+    
+    merged: Dict[str, float] = {}
+    for delta in deltas:
+        for field, amount in delta.items():
+            merged[field] = merged.get(field, 0) + amount
+    merged = {field: amount for field, amount in merged.items() if amount}
+    if not merged:
+        return
+    
+    try:
+        # No upsert: a document holding only this delta would never be reseeded. Until the
+        # counters are seeded by a full recount (migration 6 or first read), deltas are dropped.
+        stats_collection.update_one(
+            {"_id": INVENTORY_STATS_ID},
+            {"$inc": merged, "$set": {"updated_at": datetime.now(timezone.utc)}}
+        )
+    except Exception as e:
+        print(f"Inventory counter update failed: {e}")
+
+def compute_inventory_stats() -> Dict[str, Any]:
+    """Recompute every inventory counter from a full scan of products"""
+    stats = {
+        "_id": INVENTORY_STATS_ID,
+        "total_products": 0,
+        "active_products": 0,
+        "total_inventory_value": 0,
+        "price_sum": 0,
+        "by_category": {},
+        "by_status": {}
+    }
+    
+    pipeline = [
+        {
+            "$group": {
+                "_id": {"category_id": "$category_id", "status": "$status"},
+                "count": {"$sum": 1},
+                "total_value": {"$sum": {"$multiply": ["$price", "$quantity"]}},
+                "price_sum": {"$sum": "$price"}
+            }
+        }
+    ]
+    
+    for group in products_collection.aggregate(pipeline):
+        category_id = str(group['_id'].get('category_id'))
+        status = group['_id'].get('status')
+        stats["total_products"] += group['count']
+        if status == ProductStatus.ACTIVE.value:
+            stats["active_products"] += group['count']
+        stats["total_inventory_value"] += group['total_value']
+        stats["price_sum"] += group['price_sum']
+        category = stats["by_category"].setdefault(category_id, {"count": 0, "total_value": 0})
+        category["count"] += group['count']
+        category["total_value"] += group['total_value']
+        stats["by_status"][status] = stats["by_status"].get(status, 0) + group['count']
+    
+    stats["updated_at"] = datetime.now(timezone.utc)
+    return stats
+
+def _counter_drift(stored: Any, actual: Any, path: str = '') -> Dict[str, Dict]:
+    """List counters whose stored value differs from the recomputed one"""
+    drift = {}
+    if isinstance(stored, dict) or isinstance(actual, dict):
+        stored = stored if isinstance(stored, dict) else {}
+        actual = actual if isinstance(actual, dict) else {}
+        for key in set(stored) | set(actual):
+            if not path and key in ('_id', 'updated_at'):
+                continue
+            drift.update(_counter_drift(stored.get(key), actual.get(key), f"{path}{key}."))
+    elif abs((stored or 0) - (actual or 0)) > 0.005:
+        drift[path.rstrip('.')] = {"stored": stored, "actual": actual}
+    return drift
+
+def reconcile_inventory_stats(repair: bool = True) -> Dict[str, Dict]:
+    """Verify the incremental counters against a full recount, optionally repairing drift"""
+    actual = compute_inventory_stats()
+    stored = stats_collection.find_one({"_id": INVENTORY_STATS_ID}) or {}
+    drift = _counter_drift(stored, actual)
+    if repair and (drift or not stored):
+        stats_collection.replace_one({"_id": INVENTORY_STATS_ID}, actual, upsert=True)
+    return drift
+
+def load_inventory_stats() -> Dict[str, Any]:
+    """Read the counter document, seeding it from a recount on first use"""
+    stats = stats_collection.find_one({"_id": INVENTORY_STATS_ID})
+    if not stats:
+        reconcile_inventory_stats()
+        stats = stats_collection.find_one({"_id": INVENTORY_STATS_ID}) or compute_inventory_stats()
+    return stats
+
+# Typeahead suggestions served from an in-process index over product names and tags
+SUGGEST_PROJECTION = {"name": 1, "tags": 1, "price": 1, "status": 1, "category_id": 1, "views": 1}
+SUGGEST_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+SUGGEST_NAME_WEIGHT = 2
+SUGGEST_TAG_WEIGHT = 1
+
+def suggest_tokens(text: str) -> List[str]:
+    return SUGGEST_TOKEN_PATTERN.findall(text.lower()) if isinstance(text, str) else []
+
+def trigrams(token: str) -> set:
+    padded = f"  {token}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def within_edits(a: str, b: str, max_edits: int) -> bool:
+    """Levenshtein distance <= max_edits, abandoning rows that already exceed it"""
+    if abs(len(a) - len(b)) > max_edits:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > max_edits:
+            return False
+        previous = current
+    return previous[-1] <= max_edits
+
+class SuggestIndex(BackgroundWorker):
+    """Inverted index of name/tag tokens with sorted-vocabulary prefix search and trigram fuzzy matching"""
+    
+    thread_name = "suggest-refresh"
+    
+    def __init__(self, refresh_interval: float, rebuild_interval: float, max_expansions: int):
+        super().__init__()
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.max_expansions = max_expansions
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._clear()
+        # Ids removed while a rebuild is scanning; None when no rebuild is in progress
+        self._removed_during_rebuild: Optional[set] = None
+        self._synced_version = 0
+        self._synced_at: Optional[datetime] = None
+        self.builds = 0
+        self.last_build_ms = 0.0
+        self.queries = 0
+    
+    def _clear(self):
+        # Postings use small integer document numbers; hashing ObjectIds dominates large result sets
+        self._doc_numbers: Dict[ObjectId, int] = {}
+        self._entries: Dict[int, Dict] = {}
+        self._next_number = 0
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._vocabulary: List[str] = []
+        self._trigrams: Dict[str, set] = {}
+    
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+    
+    def rebuild(self):
+        """Replace the index with a fresh scan of products"""
+        started = time.perf_counter()
+        version, _ = collection_versions.get('products')
+        synced_at = datetime.now(timezone.utc)
+        with self._lock:
+            self._removed_during_rebuild = set()
+        try:
+            products = list(products_collection.find({}, SUGGEST_PROJECTION))
+        except Exception:
+            with self._lock:
+                self._removed_during_rebuild = None
+            raise
+        with self._lock:
+            # Deletes that landed after the scan read a product would otherwise be resurrected by the swap
+            removed, self._removed_during_rebuild = self._removed_during_rebuild, None
+            self._clear()
+            for product in products:
+                if product['_id'] not in removed:
+                    self._add(product)
+            self._synced_version, self._synced_at = version, synced_at
+            self.builds += 1
+            self.last_build_ms = round((time.perf_counter() - started) * 1000, 2)
+            self._ready.set()
+    
+    def _index_token(self, token: str, number: int, weight: int):
+        postings = self._postings.get(token)
+        if postings is None:
+            postings = self._postings[token] = {}
+            bisect.insort(self._vocabulary, token)
+            for gram in trigrams(token):
+                self._trigrams.setdefault(gram, set()).add(token)
+        postings[number] = max(postings.get(number, 0), weight)
+    
+    def _unindex_token(self, token: str, number: int):
+        postings = self._postings.get(token)
+        if postings is None:
+            return
+        postings.pop(number, None)
+        if not postings:
+            del self._postings[token]
+            del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+            for gram in trigrams(token):
+                tokens = self._trigrams.get(gram)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigrams[gram]
+    
+    def _tokens_of(self, entry: Dict) -> Dict[str, int]:
+        weights = {}
+        for tag in entry.get('tags') or []:
+            for token in suggest_tokens(tag):
+                weights[token] = SUGGEST_TAG_WEIGHT
+        for token in suggest_tokens(entry.get('name')):
+            weights[token] = SUGGEST_NAME_WEIGHT
+        return weights
+    
+    def _add(self, product: Dict):
+        number = self._doc_numbers.get(product['_id'])
+        if number is None:
+            number = self._doc_numbers[product['_id']] = self._next_number
+            self._next_number += 1
+        previous = self._entries.get(number, {})
+        for token in self._tokens_of(previous):
+            self._unindex_token(token, number)
+        # Partial documents (e.g. bulk update post-images) keep the fields they omit
+        entry = self._entries[number] = {**previous, **{
+            field: product[field] for field in ('_id', *SUGGEST_PROJECTION) if field in product
+        }}
+        for token, weight in self._tokens_of(entry).items():
+            self._index_token(token, number, weight)
+    
+    def _remove(self, product_id: ObjectId):
+        number = self._doc_numbers.pop(product_id, None)
+        if number is not None:
+            for token in self._tokens_of(self._entries.pop(number)):
+                self._unindex_token(token, number)
+    
+    def add(self, *products: Dict):
+        """Index new or changed products (no-op until the index has been built)"""
+        if not self._ready.is_set():
+            return
+        with self._lock:
+            for product in products:
+                self._add(product)
+    
+    def remove(self, *product_ids: ObjectId):
+        with self._lock:
+            if self._removed_during_rebuild is not None:
+                self._removed_during_rebuild.update(product_ids)
+            if not self._ready.is_set():
+                return
+            for product_id in product_ids:
+                self._remove(product_id)
+    
+    def _run(self):
+        # The first build happens here rather than in a request; searches get a 503 until it lands
+        while not self._ready.is_set():
+            try:
+                self.rebuild()
+            except Exception as e:
+                print(f"Suggest index build failed: {e}")
+                time.sleep(self.refresh_interval)
+        last_rebuild = time.monotonic()
+        while True:
+            time.sleep(self.refresh_interval)
+            try:
+                if time.monotonic() - last_rebuild >= self.rebuild_interval:
+                    # Full rebuilds pick up deletes made by other workers
+                    self.rebuild()
+                    last_rebuild = time.monotonic()
+                else:
+                    self._sync_changes()
+            except Exception as e:
+                print(f"Suggest index refresh failed: {e}")
+    
+    def _sync_changes(self):
+        """Pull products written by other workers since the last sync"""
+        version, _ = collection_versions.get('products')
+        if version == self._synced_version:
+            return
+        synced_at = datetime.now(timezone.utc)
+        changed = products_collection.find(
+            {"updated_at": {"$gte": self._synced_at - timedelta(seconds=self.refresh_interval)}}, SUGGEST_PROJECTION
+        )
+        self.add(*changed)
+        self._synced_version, self._synced_at = version, synced_at
+    
+    def _expand(self, term: str) -> Dict[str, int]:
+        """Vocabulary tokens matching a term: exact 3, prefix 2, fuzzy 1; any term may be partially typed"""
+        matches = {term: 3} if term in self._postings else {}
+        start = bisect.bisect_left(self._vocabulary, term)
+        for token in self._vocabulary[start:start + self.max_expansions]:
+            if not token.startswith(term):
+                break
+            matches.setdefault(token, 2)
+        if matches or len(term) < 3:
+            return matches
+        
+        max_edits = 1 if len(term) < 6 else 2
+        overlap: Dict[str, int] = {}
+        for gram in trigrams(term):
+            for token in self._trigrams.get(gram, ()):
+                overlap[token] = overlap.get(token, 0) + 1
+        candidates = sorted(overlap, key=overlap.get, reverse=True)[:self.max_expansions]
+        for token in candidates:
+            # A partially typed term is compared with prefixes of about its own length
+            targets = {token[:length] for length in range(len(term) - max_edits, len(term) + max_edits + 1)}
+            if any(within_edits(term, target, max_edits) for target in targets):
+                matches[token] = 1
+        return matches
+    
+    def search(self, text: str, limit: int) -> List[Dict]:
+        """Top products matching every term, ranked by match quality, field and views"""
+        terms = suggest_tokens(text)
+        if not terms or not self._ready.is_set():
+            return []
+        with self._lock:
+            self.queries += 1
+            scores: Optional[Dict[int, int]] = None
+            for term in terms:
+                term_scores: Dict[int, int] = {}
+                for token, quality in self._expand(term).items():
+                    for number, weight in self._postings[token].items():
+                        score = quality * weight
+                        if score > term_scores.get(number, 0):
+                            term_scores[number] = score
+                scores = term_scores if scores is None else {
+                    number: score + term_scores[number]
+                    for number, score in scores.items() if number in term_scores
+                }
+                if not scores:
+                    return []
+            
+            # Only the best score band can reach the top K, so rank that band alone when it is large enough
+            best = max(scores.values())
+            candidates = [number for number, score in scores.items() if score == best]
+            if len(candidates) < limit:
+                candidates = scores
+            entries = self._entries
+            ranked = heapq.nsmallest(
+                limit, candidates,
+                key=lambda number: (-scores[number], -(entries[number].get('views') or 0), entries[number].get('name', ''))
+            )
+            return [dict(entries[number], score=scores[number]) for number in ranked]
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "products": len(self._entries),
+                "tokens": len(self._vocabulary),
+                "builds": self.builds,
+                "last_build_ms": self.last_build_ms,
+                "queries": self.queries
+            }
+
+suggest_index = SuggestIndex(SUGGEST_REFRESH_INTERVAL, SUGGEST_REBUILD_INTERVAL, SUGGEST_MAX_EXPANSIONS)
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({"error": "Endpoint not found", "status": 404}), 404
@@ -168,12 +2102,70 @@ def favicon():
 def health_check():
     """Health check endpoint"""
     return jsonify({
-        "status": "healthy",
+        "status": "healthy" if mongo_connected else "degraded",
         "mongodb_connected": mongo_connected,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "mongodb": mongo_health.stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "category_cache": category_cache.stats(),
+        "audit": audit_writer.stats(),
+        "views": view_counter.stats(),
+        "response_cache": response_cache.stats(),
+        "suggest": suggest_index.stats(),
+        "mongo_pool": pool_metrics.stats()
     })
 
 # Category Management
+CATEGORY_SORT = [("name", ASCENDING), ("_id", ASCENDING)]
+# Case-insensitive comparison for the unique name_normalized index
+CATEGORY_NAME_COLLATION = {"locale": "en", "strength": 2}
+# name_normalized is a storage column for the unique index, never part of API responses
+CATEGORY_PUBLIC_PROJECTION = {"name_normalized": 0}
+
+_category_names_unique = False
+
+def category_names_unique() -> bool:
+    """True once migration 5 has built the unique name_normalized index (cached once seen)"""
+    global _category_names_unique
+    if not _category_names_unique:
+        _category_names_unique = not any(
+            migration[2] is migrate_unique_category_names for migration in pending_migrations()
+        )
+    return _category_names_unique
+
+def normalize_category_name(name: str) -> str:
+    """Canonical form used for duplicate detection: NFKC, collapsed whitespace, case-folded"""
+    return " ".join(unicodedata.normalize("NFKC", name).split()).casefold()
+
+def parse_category_page(args) -> tuple:
+    """Return (paginated, page, limit); the full list is returned unless page or limit is given"""
+    paginated = 'page' in args or 'limit' in args
+    page = int(args.get('page', 1))
+    limit = int(args.get('limit', CATEGORY_PAGE_SIZE))
+    if page < 1 or not 1 <= limit <= CATEGORY_MAX_PAGE_SIZE:
+        raise ValueError(f"page must be >= 1 and limit between 1 and {CATEGORY_MAX_PAGE_SIZE}")
+    return paginated, page, limit
+
+def with_product_counts(categories: List[Dict], stats: Dict) -> List[Dict]:
+    """Attach product counts from the inventory counters instead of joining products"""
+    by_category = stats.get('by_category', {})
+    for category in categories:
+        category['product_count'] = by_category.get(str(category['_id']), {}).get('count', 0)
+    return categories
+
+def category_page(categories: List[Dict], page: int, limit: int, total_count: int) -> Dict:
+    """Paginated response body; categories holds up to limit + 1 rows so has_next needs no count"""
+    return {
+        "categories": categories[:limit],
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total_count": total_count,
+            "total_pages": (total_count + limit - 1) // limit,
+            "has_next": len(categories) > limit,
+            "has_prev": page > 1
+        }
+    }
+
 @app.route('/api/categories', methods=['GET'])
 def get_categories():
     """Get all categories with product counts"""
@@ -181,37 +2173,33 @@ def get_categories():
         return jsonify({"error": "Database not connected"}), 503
     
     try:
-        # Aggregation pipeline to get categories with product counts
-        pipeline = [
-            {
-                "$lookup": {
-                    "from": "products",
-                    "localField": "_id",
-                    "foreignField": "category_id",
-                    "as": "products"
-                }
-            },
-            {
-                "$addFields": {
-                    "product_count": {"$size": "$products"}
-                }
-            },
-            {
-                "$project": {
-                    "products": 0
-                }
-            },
-            {
-                "$sort": {"name": 1}
-            }
-        ]
-        
-        categories = list(categories_collection.aggregate(pipeline))
-        for category in categories:
-            category['_id'] = str(category['_id'])
+        try:
+            paginated, page, limit = parse_category_page(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        # Validators come from the version counters, so a 304 needs no query
+        categories_version, categories_updated = collection_versions.get('categories')
+        products_version, products_updated = collection_versions.get('products')
+        etag = f"categories-{categories_version}-{products_version}"
+        if paginated:
+            etag += f"-{page}-{limit}"
+        last_modified = latest(categories_updated, products_updated)
+        not_modified = not_modified_response(etag, last_modified, 'categories')
+        if not_modified:
+            return not_modified
+        
+        # Categories come from the (name, _id) index; product counts from the inventory counters
+        cursor = categories_collection.find({}, CATEGORY_PUBLIC_PROJECTION).sort(CATEGORY_SORT)
+        if paginated:
+            cursor = cursor.skip((page - 1) * limit).limit(limit + 1)
+        categories = with_product_counts(list(cursor), load_inventory_stats())
             
         log_audit(AuditAction.READ, "categories")
-        return jsonify(categories)
+        if paginated:
+            body = category_page(categories, page, limit, categories_collection.estimated_document_count())
+            return with_cache_headers(jsonify(body), etag, last_modified, 'categories')
+        return with_cache_headers(jsonify(categories), etag, last_modified, 'categories')
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -226,17 +2214,23 @@ def create_category():
         data = request.get_json()
         
         # Validation
-        if not data.get('name') or len(data['name'].strip()) < 2:
+        if not isinstance(data.get('name'), str) or len(data['name'].strip()) < 2:
             return jsonify({"error": "Category name must be at least 2 characters"}), 400
-            
-        # Check if category already exists
-        existing = categories_collection.find_one({"name": {"$regex": f"^{data['name']}$", "$options": "i"}})
-        if existing:
+        
+        # The unique name_normalized index (migration 5) rejects duplicates atomically. Until it exists,
+        # fall back to a lookup that also matches legacy rows not yet backfilled (a collection scan).
+        name_normalized = normalize_category_name(data['name'])
+        if not category_names_unique() and categories_collection.find_one(
+            {"$or": [{"name_normalized": name_normalized}, {"name": data['name'].strip()}]},
+            {"_id": 1},
+            collation=CATEGORY_NAME_COLLATION
+        ):
             return jsonify({"error": "Category already exists"}), 409
         
         now = datetime.now(timezone.utc)
         category = {
             "name": data['name'].strip(),
+            "name_normalized": name_normalized,
             "description": data.get('description', '').strip(),
             "color": data.get('color', '#007bff'),
             "icon": data.get('icon', 'fas fa-box'),
@@ -244,11 +2238,17 @@ def create_category():
             "updated_at": now
         }
         
-        result = categories_collection.insert_one(category)
-        category['_id'] = str(result.inserted_id)
+        try:
+            result = categories_collection.insert_one(category)
+        except DuplicateKeyError:
+            return jsonify({"error": "Category already exists"}), 409
+        category_cache.invalidate(result.inserted_id)
+        del category['name_normalized']
         
         log_audit(AuditAction.CREATE, "category", str(result.inserted_id), category)
         update_analytics("category_created")
+        collection_versions.bump('categories')
+        mark_dashboard_dirty()
         
         return jsonify(category), 201
         
@@ -256,6 +2256,32 @@ def create_category():
         return jsonify({"error": str(e)}), 500
 
 # Product Management
+def product_filters(category_id: str, status: str, price_min: Optional[float], price_max: Optional[float]) -> Dict:
+    """Category, status and price range conditions shared by listing and search"""
+    filters = {}
+    
+    # Filter by category
+    if category_id:
+        try:
+            filters["category_id"] = ObjectId(category_id)
+        except:
+            pass
+    
+    # Filter by status
+    if status:
+        filters["status"] = status
+        
+    # Price range filter
+    if price_min is not None or price_max is not None:
+        price_query = {}
+        if price_min is not None:
+            price_query["$gte"] = price_min
+        if price_max is not None:
+            price_query["$lte"] = price_max
+        filters["price"] = price_query
+    
+    return filters
+
 @app.route('/api/products', methods=['GET'])
 def get_products():
     """Get products with advanced filtering, searching, and pagination"""
@@ -273,6 +2299,29 @@ def get_products():
         sort_order = request.args.get('sort_order', 'desc')
         price_min = request.args.get('price_min', type=float)
         price_max = request.args.get('price_max', type=float)
+        cursor_token = request.args.get('cursor', '').strip()
+        count_mode = request.args.get('count', 'none' if cursor_token else 'exact')
+        sort_order = 'asc' if sort_order == 'asc' else 'desc'
+        
+        if count_mode not in COUNT_MODES:
+            return jsonify({"error": f"count must be one of: {', '.join(COUNT_MODES)}"}), 400
+        if sort_by not in SORTABLE_FIELDS:
+            return jsonify({"error": f"sort_by must be one of: {', '.join(SORTABLE_FIELDS)}"}), 400
+        
+        # Normalized parameters identify the page for both ETags and the response cache
+        normalized_params, etag, cache_key, last_modified = list_cache_key('products', [
+            page, limit, search, category_id, status, sort_by, sort_order,
+            price_min, price_max, cursor_token, count_mode
+        ])
+        not_modified = not_modified_response(etag, last_modified, 'products')
+        if not_modified:
+            return not_modified
+        
+        cached_body = response_cache.get(cache_key)
+        if cached_body is not None:
+            log_audit(AuditAction.READ, "products", details={"params": normalized_params, "cache_hit": True})
+            response = Response(cached_body, mimetype='application/json')
+            return with_cache_headers(response, etag, last_modified, 'products')
         
         # Build query
         query = {}
@@ -280,67 +2329,52 @@ def get_products():
         # Search in name, description, and tags
         if search:
             query["$text"] = {"$search": search}
+        query.update(product_filters(category_id, status, price_min, price_max))
         
-        # Filter by category
-        if category_id:
-            try:
-                query["category_id"] = ObjectId(category_id)
-            except:
-                pass
-        
-        # Filter by status
-        if status:
-            query["status"] = status
-            
-        # Price range filter
-        if price_min is not None or price_max is not None:
-            price_query = {}
-            if price_min is not None:
-                price_query["$gte"] = price_min
-            if price_max is not None:
-                price_query["$lte"] = price_max
-            query["price"] = price_query
-        
-        # Sorting
+        # Sorting (_id breaks ties so keyset cursors are stable)
         sort_direction = DESCENDING if sort_order == 'desc' else ASCENDING
-        sort_field = [(sort_by, sort_direction)]
-        
-        # Execute query with pagination
-        skip = (page - 1) * limit
-        products = list(products_collection.find(query).sort(sort_field).skip(skip).limit(limit))
-        total_count = products_collection.count_documents(query)
+        sort_field = [(sort_by, sort_direction), ("_id", sort_direction)]
         
-        # Convert ObjectId to string and add category information
-        for product in products:
-            product['_id'] = str(product['_id'])
-            product['category_id'] = str(product['category_id'])
-            
-            # Get category info
-            category = categories_collection.find_one({"_id": ObjectId(product['category_id'])})
-            if category:
-                product['category'] = {
-                    "_id": str(category['_id']),
-                    "name": category['name'],
-                    "color": category.get('color', '#007bff'),
-                    "icon": category.get('icon', 'fas fa-box')
-                }
+        # Execute query with keyset (cursor) or offset pagination, fetching one extra row for has_next
+        count_query = dict(query)
+        if cursor_token:
+            try:
+                cursor = decode_cursor(cursor_token, sort_by, sort_order)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            query["$or"] = keyset_filter(cursor, sort_by, sort_direction)
+            skip = 0
+        else:
+            skip = (page - 1) * limit
+        products = list(products_collection.find(query).sort(sort_field).skip(skip).limit(limit + 1))
+        query_planner.observe(query, sort_field, skip, limit + 1)
+        
+        has_next = len(products) > limit
+        products = products[:limit]
+        next_cursor = encode_cursor(products[-1], sort_by, sort_order) if has_next and products else None
+        total_count, count_exact = count_products(count_query, count_mode)
+        
+        # Add category information in one round trip
+        embed_categories(products)
         
         # Calculate pagination info
-        total_pages = (total_count + limit - 1) // limit
-        has_next = page < total_pages
-        has_prev = page > 1
+        total_pages = (total_count + limit - 1) // limit if total_count is not None and count_exact else None
+        has_prev = bool(cursor_token) or page > 1
         
         log_audit(AuditAction.READ, "products", details={"query": query, "count": len(products)})
         
-        return jsonify({
+        response = jsonify({
             "products": products,
             "pagination": {
-                "page": page,
+                "page": None if cursor_token else page,
                 "limit": limit,
                 "total_count": total_count,
+                "count_mode": count_mode,
+                "count_exact": count_exact,
                 "total_pages": total_pages,
                 "has_next": has_next,
-                "has_prev": has_prev
+                "has_prev": has_prev,
+                "next_cursor": next_cursor
             },
             "filters": {
                 "search": search,
@@ -350,6 +2384,8 @@ def get_products():
                 "price_max": price_max
             }
         })
+        response_cache.set(cache_key, response.get_data())
+        return with_cache_headers(response, etag, last_modified, 'products')
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -363,77 +2399,195 @@ def create_product():
     try:
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = ['name', 'description', 'category_id', 'price', 'quantity']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
-        # Create and validate product schema
-        product_data = ProductSchema(
-            name=data['name'],
-            description=data['description'],
-            category_id=data['category_id'],
-            price=float(data['price']),
-            quantity=int(data['quantity']),
-            tags=data.get('tags', []),
-            status=data.get('status', ProductStatus.ACTIVE.value)
-        )
-        
-        validation_errors = product_data.validate()
-        if validation_errors:
-            print(f"Product validation errors: {validation_errors}")
-            return jsonify({"error": "Validation failed", "details": validation_errors}), 400
+        # Validate against the compiled product schema
+        try:
+            product = product_schema.load(data)
+        except ValidationError as e:
+            print(f"Product validation errors: {e.messages}")
+            return jsonify({"error": "Validation failed", "details": e.messages}), 400
         
         # Verify category exists
-        try:
-            category_obj_id = ObjectId(data['category_id'])
-            category = categories_collection.find_one({"_id": category_obj_id})
-            if not category:
-                return jsonify({"error": "Category not found"}), 404
-        except:
-            return jsonify({"error": "Invalid category ID"}), 400
+        category = category_cache.get(product['category_id'])
+        if not category:
+            return jsonify({"error": "Category not found"}), 404
         
         # Create product document
-        now = datetime.now(timezone.utc)
-        product = {
-            "name": product_data.name.strip(),
-            "description": product_data.description.strip(),
-            "category_id": category_obj_id,
-            "price": product_data.price,
-            "quantity": product_data.quantity,
-            "tags": [tag.strip() for tag in product_data.tags if tag.strip()],
-            "status": product_data.status,
-            "created_at": now,
-            "updated_at": now,
-            "views": 0,
-            "last_viewed": None
-        }
+        product = product_document(product, datetime.now(timezone.utc))
         
         result = products_collection.insert_one(product)
-        product['_id'] = str(result.inserted_id)
-        product['category_id'] = str(product['category_id'])
-        
-        # Add category info to response
-        product['category'] = {
-            "_id": str(category['_id']),
-            "name": category['name'],
-            "color": category.get('color', '#007bff'),
-            "icon": category.get('icon', 'fas fa-box')
-        }
+        apply_inventory_deltas(inventory_delta(product))
+        suggest_index.add(product)
+        
+        # Add category info to response (already fetched during validation)
+        embed_categories([product], {product['category_id']: category})
         
         log_audit(AuditAction.CREATE, "product", str(result.inserted_id), product)
-        update_analytics("product_created", {"category": category['name'], "price": product_data.price})
+        update_analytics("product_created", {
+            "category_id": str(product['category_id']),
+            "category": category['name'],
+            "price": product['price']
+        })
+        collection_versions.bump('products')
+        mark_dashboard_dirty()
         
         return jsonify(product), 201
         
-    except ValueError as e:
-        print(f"Product creation ValueError: {e}")
-        return jsonify({"error": f"Invalid data type: {str(e)}"}), 400
+    except ValueError as e:
+        print(f"Product creation ValueError: {e}")
+        return jsonify({"error": f"Invalid data type: {str(e)}"}), 400
+    except Exception as e:
+        print(f"Product creation error: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+# Relevance-ranked search with facet counts
+def search_pipeline(search: str, filters: Dict, skip: int, limit: int) -> List[Dict]:
+    """One aggregation returning a page ranked by text score plus category, status and price facets.
+    
+    Each facet applies every filter except its own, so the counts show what
+    selecting another value of that facet would return.
+    """
+    def match_except(excluded: Optional[str]) -> Dict:
+        return {"$match": {field: condition for field, condition in filters.items() if field != excluded}}
+    
+    return [
+        {"$match": {"$text": {"$search": search}}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+        {"$facet": {
+            "results": [match_except(None), {"$sort": {"score": -1, "_id": 1}}, {"$skip": skip}, {"$limit": limit + 1}],
+            "total": [match_except(None), {"$count": "count"}],
+            "categories": [
+                match_except("category_id"),
+                {"$group": {"_id": "$category_id", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}}
+            ],
+            "status": [
+                match_except("status"),
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}}
+            ],
+            "price": [
+                match_except("price"),
+                {"$bucket": {
+                    "groupBy": "$price",
+                    "boundaries": ANALYTICS_PRICE_BUCKETS,
+                    "default": f"{ANALYTICS_PRICE_BUCKETS[-1]}+",
+                    "output": {"count": {"$sum": 1}}
+                }}
+            ]
+        }}
+    ]
+
+def search_facets(facets: Dict) -> Dict[str, List[Dict]]:
+    """Label facet buckets: category names from the cache, price ranges as in the analytics histogram"""
+    categories = category_cache.get_many([bucket['_id'] for bucket in facets['categories'] if bucket['_id'] is not None])
+    price_labels = {
+        lower: f"{lower}-{upper}" for lower, upper in zip(ANALYTICS_PRICE_BUCKETS, ANALYTICS_PRICE_BUCKETS[1:])
+    }
+    return {
+        "categories": [
+            {"_id": bucket['_id'], "name": categories[bucket['_id']]['name'], "count": bucket['count']}
+            for bucket in facets['categories'] if bucket['_id'] in categories
+        ],
+        "status": facets['status'],
+        "price": [
+            {"bucket": price_labels.get(bucket['_id'], bucket['_id']), "count": bucket['count']}
+            for bucket in facets['price']
+        ]
+    }
+
+@app.route('/api/products/search', methods=['GET'])
+def search_products():
+    """Full-text search ranked by weighted text score, with facet counts in the same response"""
+    if not mongo_connected:
+        return jsonify({"error": "Database not connected"}), 503
+    
+    try:
+        search = request.args.get('q', '').strip()
+        page = max(int(request.args.get('page', 1)), 1)
+        limit = int(request.args.get('limit', ITEMS_PER_PAGE))
+        category_id = request.args.get('category_id', '')
+        status = request.args.get('status', '')
+        price_min = request.args.get('price_min', type=float)
+        price_max = request.args.get('price_max', type=float)
+        
+        if not search:
+            return jsonify({"error": "q is required"}), 400
+        
+        _, etag, cache_key, last_modified = list_cache_key(
+            'search', [search, page, limit, category_id, status, price_min, price_max]
+        )
+        not_modified = not_modified_response(etag, last_modified, 'products')
+        if not_modified:
+            return not_modified
+        
+        cached_body = response_cache.get(cache_key)
+        if cached_body is not None:
+            log_audit(AuditAction.READ, "products", details={"search": search, "cache_hit": True})
+            response = Response(cached_body, mimetype='application/json')
+            return with_cache_headers(response, etag, last_modified, 'products')
+        
+        filters = product_filters(category_id, status, price_min, price_max)
+        skip = (page - 1) * limit
+        facets = next(products_collection.aggregate(search_pipeline(search, filters, skip, limit)))
+        
+        products = facets['results'][:limit]
+        has_next = len(facets['results']) > limit
+        total_count = facets['total'][0]['count'] if facets['total'] else 0
+        embed_categories(products)
+        
+        log_audit(AuditAction.READ, "products", details={"search": search, "count": len(products)})
+        
+        response = jsonify({
+            "products": products,
+            "pagination": {
+                "page": page,
+                "limit": limit,
+                "total_count": total_count,
+                "count_mode": "exact",
+                "count_exact": True,
+                "total_pages": (total_count + limit - 1) // limit,
+                "has_next": has_next,
+                "has_prev": page > 1,
+                "next_cursor": None
+            },
+            "filters": {
+                "search": search,
+                "category_id": category_id,
+                "status": status,
+                "price_min": price_min,
+                "price_max": price_max
+            },
+            "facets": search_facets(facets)
+        })
+        response_cache.set(cache_key, response.get_data())
+        return with_cache_headers(response, etag, last_modified, 'products')
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/products/suggest', methods=['GET'])
+def suggest_products():
+    """Typeahead: top-K products whose name or tags match the typed prefix, without a database round trip"""
+    if not suggest_index.ready:
+        if not mongo_connected:
+            return jsonify({"error": "Database not connected"}), 503
+        # Normally started by create_app; the build runs on the worker thread, never in this request
+        suggest_index.ensure_started()
+        return jsonify({"error": "Suggest index is building"}), 503, {"Retry-After": "1"}
+    
+    try:
+        text = request.args.get('q', '').strip()
+        limit = min(max(request.args.get('limit', SUGGEST_LIMIT, type=int), 1), SUGGEST_MAX_LIMIT)
+        started = time.perf_counter()
+        suggestions = suggest_index.search(text, limit)
+        return jsonify({
+            "query": text,
+            "suggestions": suggestions,
+            "took_ms": round((time.perf_counter() - started) * 1000, 3)
+        })
     except Exception as e:
-        print(f"Product creation error: {e}")
-        import traceback
-        traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/products/<product_id>', methods=['GET'])
@@ -443,31 +2597,36 @@ def get_product(product_id):
         return jsonify({"error": "Database not connected"}), 503
     
     try:
+        categories_version, categories_updated = collection_versions.get('categories')
+        
+        # Revalidation only needs the validator fields, so skip the full document and category join
+        if request.if_none_match or request.if_modified_since:
+            current = products_collection.find_one(
+                {"_id": ObjectId(product_id)}, {"version": 1, "views": 1, "updated_at": 1, "last_viewed": 1}
+            )
+            if current:
+                not_modified = not_modified_response(
+                    version_etag(current, categories_version), product_last_modified(current, categories_updated), 'product', weak=False
+                )
+                if not_modified:
+                    view_counter.record(current['_id'])
+                    return not_modified
+        
         product = products_collection.find_one({"_id": ObjectId(product_id)})
         if not product:
             return jsonify({"error": "Product not found"}), 404
         
-        # Update view count
-        products_collection.update_one(
-            {"_id": ObjectId(product_id)},
-            {"$inc": {"views": 1}, "$set": {"last_viewed": datetime.now(timezone.utc)}}
-        )
-        
-        product['_id'] = str(product['_id'])
-        product['category_id'] = str(product['category_id'])
+        # Update view count (buffered, flushed every VIEW_FLUSH_INTERVAL seconds)
+        view_counter.record(product['_id'])
         
         # Get category info
-        category = categories_collection.find_one({"_id": ObjectId(product['category_id'])})
-        if category:
-            product['category'] = {
-                "_id": str(category['_id']),
-                "name": category['name'],
-                "color": category.get('color', '#007bff'),
-                "icon": category.get('icon', 'fas fa-box')
-            }
+        embed_categories([product])
         
         log_audit(AuditAction.READ, "product", product_id)
-        return jsonify(product)
+        return with_cache_headers(
+            jsonify(product), version_etag(product, categories_version),
+            product_last_modified(product, categories_updated), 'product', weak=False
+        )
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -481,86 +2640,41 @@ def update_product(product_id):
     try:
         data = request.get_json()
         
-        # Check if product exists
-        existing_product = products_collection.find_one({"_id": ObjectId(product_id)})
-        if not existing_product:
-            return jsonify({"error": "Product not found"}), 404
-        
         # Prepare update data
-        update_data = {"updated_at": datetime.now(timezone.utc)}
-        
-        # Update only provided fields
-        if 'name' in data:
-            if not data['name'] or len(data['name'].strip()) < 2:
-                return jsonify({"error": "Name must be at least 2 characters"}), 400
-            update_data['name'] = data['name'].strip()
-        
-        if 'description' in data:
-            if not data['description'] or len(data['description'].strip()) < 10:
-                return jsonify({"error": "Description must be at least 10 characters"}), 400
-            update_data['description'] = data['description'].strip()
-        
-        if 'category_id' in data:
-            try:
-                category_obj_id = ObjectId(data['category_id'])
-                category = categories_collection.find_one({"_id": category_obj_id})
-                if not category:
-                    return jsonify({"error": "Category not found"}), 404
-                update_data['category_id'] = category_obj_id
-            except:
-                return jsonify({"error": "Invalid category ID"}), 400
-        
-        if 'price' in data:
-            try:
-                price = float(data['price'])
-                if price <= 0:
-                    return jsonify({"error": "Price must be greater than 0"}), 400
-                update_data['price'] = price
-            except ValueError:
-                return jsonify({"error": "Invalid price format"}), 400
-        
-        if 'quantity' in data:
-            try:
-                quantity = int(data['quantity'])
-                if quantity < 0:
-                    return jsonify({"error": "Quantity cannot be negative"}), 400
-                update_data['quantity'] = quantity
-            except ValueError:
-                return jsonify({"error": "Invalid quantity format"}), 400
-        
-        if 'tags' in data:
-            update_data['tags'] = [tag.strip() for tag in data['tags'] if tag.strip()]
-        
-        if 'status' in data:
-            if data['status'] not in [status.value for status in ProductStatus]:
-                return jsonify({"error": "Invalid status"}), 400
-            update_data['status'] = data['status']
-        
-        # Update product
-        products_collection.update_one(
-            {"_id": ObjectId(product_id)},
-            {"$set": update_data}
+        update_data, error = build_product_update(data)
+        if error:
+            return jsonify(error[0]), error[1]
+        
+        expected_version, error = parse_if_match()
+        if error:
+            return error
+        
+        # Check existence, apply the update and bump the version in one atomic round trip.
+        # The pre-image feeds the inventory deltas; the post-image is derived from it
+        # because the update is a plain $set.
+        existing_product = products_collection.find_one_and_update(
+            version_filter(ObjectId(product_id), expected_version),
+            {"$set": update_data, "$inc": {"version": 1}},
+            return_document=ReturnDocument.BEFORE
         )
+        if not existing_product:
+            return write_miss_response(ObjectId(product_id), expected_version)
         
-        # Get updated product
-        updated_product = products_collection.find_one({"_id": ObjectId(product_id)})
-        updated_product['_id'] = str(updated_product['_id'])
-        updated_product['category_id'] = str(updated_product['category_id'])
+        updated_product = {**existing_product, **update_data, "version": existing_product.get('version', 0) + 1}
+        apply_inventory_deltas(inventory_delta(existing_product, -1), inventory_delta(updated_product))
+        suggest_index.add(updated_product)
         
-        # Add category info
-        category = categories_collection.find_one({"_id": ObjectId(updated_product['category_id'])})
-        if category:
-            updated_product['category'] = {
-                "_id": str(category['_id']),
-                "name": category['name'],
-                "color": category.get('color', '#007bff'),
-                "icon": category.get('icon', 'fas fa-box')
-            }
+        # Add category info (served from the cache warmed by validation)
+        embed_categories([updated_product])
         
         log_audit(AuditAction.UPDATE, "product", product_id, update_data)
         update_analytics("product_updated")
+        collection_versions.bump('products')
+        mark_dashboard_dirty()
         
-        return jsonify(updated_product)
+        response = jsonify(updated_product)
+        response.set_etag(version_etag(updated_product, collection_versions.get('categories')[0]))
+        return response
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -572,16 +2686,25 @@ def delete_product(product_id):
         return jsonify({"error": "Database not connected"}), 503
     
     try:
-        # Check if product exists
-        product = products_collection.find_one({"_id": ObjectId(product_id)})
+        expected_version, error = parse_if_match()
+        if error:
+            return error
+        
+        # Check existence and delete in one atomic round trip
+        product = products_collection.find_one_and_delete(
+            version_filter(ObjectId(product_id), expected_version),
+            projection=INVENTORY_PROJECTION
+        )
         if not product:
-            return jsonify({"error": "Product not found"}), 404
+            return write_miss_response(ObjectId(product_id), expected_version)
         
-        # Delete product
-        products_collection.delete_one({"_id": ObjectId(product_id)})
+        apply_inventory_deltas(inventory_delta(product, -1))
+        suggest_index.remove(product['_id'])
         
         log_audit(AuditAction.DELETE, "product", product_id, {"name": product.get('name')})
         update_analytics("product_deleted")
+        collection_versions.bump('products')
+        mark_dashboard_dirty()
         
         return jsonify({"message": "Product deleted successfully"})
         
@@ -605,59 +2728,17 @@ def bulk_create_products():
         if len(products_data) > 100:
             return jsonify({"error": "Maximum 100 products allowed per bulk operation"}), 400
         
-        valid_products = []
-        errors = []
-        
-        for i, product_data in enumerate(products_data):
-            try:
-                # Validate product
-                product_schema = ProductSchema(
-                    name=product_data['name'],
-                    description=product_data['description'],
-                    category_id=product_data['category_id'],
-                    price=float(product_data['price']),
-                    quantity=int(product_data['quantity']),
-                    tags=product_data.get('tags', []),
-                    status=product_data.get('status', ProductStatus.ACTIVE.value)
-                )
-                
-                validation_errors = product_schema.validate()
-                if validation_errors:
-                    errors.append({"index": i, "errors": validation_errors})
-                    continue
-                
-                # Verify category exists
-                category_obj_id = ObjectId(product_data['category_id'])
-                category = categories_collection.find_one({"_id": category_obj_id})
-                if not category:
-                    errors.append({"index": i, "errors": {"category_id": "Category not found"}})
-                    continue
-                
-                now = datetime.now(timezone.utc)
-                product = {
-                    "name": product_schema.name.strip(),
-                    "description": product_schema.description.strip(),
-                    "category_id": category_obj_id,
-                    "price": product_schema.price,
-                    "quantity": product_schema.quantity,
-                    "tags": [tag.strip() for tag in product_schema.tags if tag.strip()],
-                    "status": product_schema.status,
-                    "created_at": now,
-                    "updated_at": now,
-                    "views": 0,
-                    "last_viewed": None
-                }
-                
-                valid_products.append(product)
-                
-            except Exception as e:
-                errors.append({"index": i, "errors": {"general": str(e)}})
+        documents, invalid = validate_product_batch(products_data, datetime.now(timezone.utc))
+        valid_products = [document for _, document in documents]
+        errors = [{"index": i, "errors": item_errors} for i, item_errors in invalid]
         
         # Insert valid products
         inserted_count = 0
         if valid_products:
             result = products_collection.insert_many(valid_products)
             inserted_count = len(result.inserted_ids)
+            apply_inventory_deltas(*(inventory_delta(product) for product in valid_products))
+            suggest_index.add(*valid_products)
         
         log_audit(AuditAction.BULK_CREATE, "products", details={
             "total_attempted": len(products_data),
@@ -665,6 +2746,8 @@ def bulk_create_products():
             "errors": len(errors)
         })
         update_analytics("bulk_products_created", {"count": inserted_count})
+        collection_versions.bump('products')
+        mark_dashboard_dirty()
         
         return jsonify({
             "message": f"Bulk operation completed",
@@ -676,127 +2759,647 @@ def bulk_create_products():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-# Analytics Dashboard
-@app.route('/api/analytics/dashboard', methods=['GET'])
-def get_dashboard_analytics():
-    """Get analytics data for dashboard"""
+def build_bulk_filter(spec: Dict) -> Dict:
+    """Translate a bulk filter spec (category_id, status, price_min, price_max) into a query"""
+    if not isinstance(spec, dict) or not spec:
+        raise ValueError("Filter must be a non-empty object")
+    unknown = set(spec) - {'category_id', 'status', 'price_min', 'price_max'}
+    if unknown:
+        raise ValueError(f"Unsupported filter fields: {', '.join(sorted(unknown))}")
+    
+    query = {}
+    if 'category_id' in spec:
+        if not ObjectId.is_valid(str(spec['category_id'])):
+            raise ValueError("Invalid category ID")
+        query['category_id'] = ObjectId(spec['category_id'])
+    if 'status' in spec:
+        query['status'] = spec['status']
+    if 'price_min' in spec or 'price_max' in spec:
+        query['price'] = {}
+        if 'price_min' in spec:
+            query['price']['$gte'] = float(spec['price_min'])
+        if 'price_max' in spec:
+            query['price']['$lte'] = float(spec['price_max'])
+    return query
+
+def fetch_for_bulk(query: Dict) -> Dict[ObjectId, Dict]:
+    """Load the inventory-relevant fields and version of every product a bulk operation will touch"""
+    documents = list(products_collection.find(query, {**INVENTORY_PROJECTION, "version": 1}).limit(BULK_FILTER_MAX_MATCHES + 1))
+    if len(documents) > BULK_FILTER_MAX_MATCHES:
+        raise ValueError(f"Filter matches more than {BULK_FILTER_MAX_MATCHES} products")
+    return {document['_id']: document for document in documents}
+
+def run_bulk_write(operations: List) -> tuple:
+    """Run an unordered bulk_write; returns (result_counts, {operation_index: errmsg}, general_error).
+    
+    Unordered writes keep going past failures, so a BulkWriteError (or a connection error
+    partway through) can leave some operations applied. Callers re-read the affected
+    documents to settle per-item statuses and bookkeeping rather than trusting either path.
+    """
+    try:
+        result = products_collection.bulk_write(operations, ordered=False)
+        return result.bulk_api_result, {}, None
+    except BulkWriteError as e:
+        write_errors = {error['index']: error.get('errmsg') for error in e.details.get('writeErrors', [])}
+        return e.details, write_errors, None
+    except Exception as e:
+        return None, {}, str(e)
+
+@app.route('/api/products/bulk', methods=['PATCH'])
+def bulk_update_products():
+    """Bulk update products by per-id patches or a filter, in one unordered bulk_write"""
     if not mongo_connected:
         return jsonify({"error": "Database not connected"}), 503
     
     try:
-        # Product statistics
-        total_products = products_collection.count_documents({})
-        active_products = products_collection.count_documents({"status": "active"})
-        total_categories = categories_collection.count_documents({})
-        
-        # Products by category
-        category_pipeline = [
-            {
-                "$group": {
-                    "_id": "$category_id",
-                    "count": {"$sum": 1},
-                    "total_value": {"$sum": {"$multiply": ["$price", "$quantity"]}}
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "categories",
-                    "localField": "_id",
-                    "foreignField": "_id",
-                    "as": "category"
-                }
-            },
-            {
-                "$unwind": "$category"
-            },
-            {
-                "$project": {
-                    "category_name": "$category.name",
-                    "count": 1,
-                    "total_value": 1
-                }
-            },
-            {
-                "$sort": {"count": -1}
-            }
-        ]
+        data = request.get_json() or {}
+        results = []
+        operations = []
+        # (result index, product id, operation index) for every product a write targets
+        targets = []
+        
+        if 'updates' in data:
+            updates = data['updates']
+            if not isinstance(updates, list) or not updates:
+                return jsonify({"error": "updates must be a non-empty list"}), 400
+            if len(updates) > BULK_MAX_ITEMS:
+                return jsonify({"error": f"Maximum {BULK_MAX_ITEMS} updates allowed per bulk operation"}), 400
+            
+            patches = []
+            for i, item in enumerate(updates):
+                product_id = str(item.get('_id', '')) if isinstance(item, dict) else ''
+                if not ObjectId.is_valid(product_id):
+                    results.append({"index": i, "_id": product_id, "status": "invalid", "error": "Invalid product ID"})
+                    continue
+                update_data, error = build_product_update(item.get('set') or {})
+                if error:
+                    results.append({"index": i, "_id": product_id, "status": "invalid", **error[0]})
+                    continue
+                patches.append((i, ObjectId(product_id), update_data))
+            
+            before = fetch_for_bulk({"_id": {"$in": [product_id for _, product_id, _ in patches]}})
+            for i, product_id, update_data in patches:
+                if product_id not in before:
+                    results.append({"index": i, "_id": str(product_id), "status": "not_found"})
+                    continue
+                targets.append((i, product_id, len(operations)))
+                operations.append(UpdateOne({"_id": product_id}, {"$set": update_data, "$inc": {"version": 1}}))
+        
+        elif 'filter' in data:
+            try:
+                query = build_bulk_filter(data['filter'])
+            except (TypeError, ValueError) as e:
+                return jsonify({"error": str(e)}), 400
+            update_data, error = build_product_update(data.get('set') or {})
+            if error:
+                return jsonify(error[0]), error[1]
+            
+            update = {"$set": update_data, "$inc": {"version": 1}}
+            if 'price_multiplier' in data:
+                try:
+                    multiplier = float(data['price_multiplier'])
+                except (TypeError, ValueError):
+                    return jsonify({"error": "Invalid price_multiplier"}), 400
+                if multiplier <= 0 or 'price' in update_data:
+                    return jsonify({"error": "price_multiplier must be > 0 and cannot be combined with price"}), 400
+                update["$mul"] = {"price": multiplier}
+            
+            try:
+                before = fetch_for_bulk(query)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            if before:
+                # Restrict to the documents read above so the inventory deltas stay exact
+                operations.append(UpdateMany({**query, "_id": {"$in": list(before)}}, update))
+                targets = [(i, product_id, 0) for i, product_id in enumerate(before)]
+        
+        else:
+            return jsonify({"error": "Provide either 'updates' or 'filter'"}), 400
+        
+        matched = modified = 0
+        if operations:
+            counts, write_errors, general_error = run_bulk_write(operations)
+            
+            # Settle statuses and bookkeeping from what was actually written: every applied
+            # update bumps the version, whether or not the bulk write raised
+            after = {document['_id']: document for document in products_collection.find(
+                {"_id": {"$in": list(before)}}, {**INVENTORY_PROJECTION, "tags": 1, "version": 1}
+            )}
+            applied = [product_id for product_id, document in after.items()
+                       if document.get('version') != before[product_id].get('version')]
+            for i, product_id, operation_index in targets:
+                if product_id in applied:
+                    results.append({"index": i, "_id": str(product_id), "status": "updated"})
+                elif product_id not in after:
+                    results.append({"index": i, "_id": str(product_id), "status": "not_found"})
+                else:
+                    error = write_errors.get(operation_index) or general_error or "Update was not applied"
+                    results.append({"index": i, "_id": str(product_id), "status": "failed", "error": error})
+            
+            if counts:
+                matched, modified = counts.get('nMatched', 0), counts.get('nModified', 0)
+            else:
+                matched = modified = len(applied)
+            apply_inventory_deltas(
+                *(inventory_delta(before[product_id], -1) for product_id in applied),
+                *(inventory_delta(after[product_id]) for product_id in applied)
+            )
+            suggest_index.add(*(after[product_id] for product_id in applied))
+        
+        results.sort(key=lambda item: item['index'])
+        log_audit(AuditAction.BULK_UPDATE, "products", details={
+            "mode": "updates" if 'updates' in data else "filter",
+            "total_attempted": len(data['updates']) if 'updates' in data else len(before),
+            "matched": matched,
+            "modified": modified,
+            "errors": sum(1 for item in results if item['status'] != 'updated')
+        })
+        update_analytics("bulk_products_updated", {"count": modified})
+        collection_versions.bump('products')
+        mark_dashboard_dirty()
         
-        products_by_category = list(products_collection.aggregate(category_pipeline))
+        return jsonify({
+            "message": "Bulk update completed",
+            "matched": matched,
+            "modified": modified,
+            "results": results
+        })
         
-        # Convert ObjectIds to strings for JSON serialization
-        for item in products_by_category:
-            if '_id' in item:
-                item['_id'] = str(item['_id'])
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/products/bulk', methods=['DELETE'])
+def bulk_delete_products():
+    """Bulk delete products by id list or filter, in one unordered bulk_write"""
+    if not mongo_connected:
+        return jsonify({"error": "Database not connected"}), 503
+    
+    try:
+        data = request.get_json() or {}
+        results = []
+        operations = []
+        # (result index, product id, operation index) for every product a write targets
+        targets = []
+        
+        if 'ids' in data:
+            ids = data['ids']
+            if not isinstance(ids, list) or not ids:
+                return jsonify({"error": "ids must be a non-empty list"}), 400
+            if len(ids) > BULK_MAX_ITEMS:
+                return jsonify({"error": f"Maximum {BULK_MAX_ITEMS} ids allowed per bulk operation"}), 400
+            
+            valid_ids = [ObjectId(product_id) for product_id in ids if ObjectId.is_valid(str(product_id))]
+            before = fetch_for_bulk({"_id": {"$in": valid_ids}})
+            for i, product_id in enumerate(ids):
+                if not ObjectId.is_valid(str(product_id)):
+                    results.append({"index": i, "_id": str(product_id), "status": "invalid", "error": "Invalid product ID"})
+                elif ObjectId(product_id) not in before:
+                    results.append({"index": i, "_id": str(product_id), "status": "not_found"})
+                else:
+                    targets.append((i, ObjectId(product_id), len(operations)))
+                    operations.append(DeleteOne({"_id": ObjectId(product_id)}))
+        
+        elif 'filter' in data:
+            try:
+                query = build_bulk_filter(data['filter'])
+                before = fetch_for_bulk(query)
+            except (TypeError, ValueError) as e:
+                return jsonify({"error": str(e)}), 400
+            if before:
+                operations.append(DeleteMany({**query, "_id": {"$in": list(before)}}))
+                targets = [(i, product_id, 0) for i, product_id in enumerate(before)]
+        
+        else:
+            return jsonify({"error": "Provide either 'ids' or 'filter'"}), 400
+        
+        deleted = 0
+        if operations:
+            counts, write_errors, general_error = run_bulk_write(operations)
+            
+            # Settle statuses and bookkeeping from what is actually gone, whether or not the bulk write raised
+            remaining = {document['_id'] for document in products_collection.find({"_id": {"$in": list(before)}}, {"_id": 1})}
+            removed = [product_id for product_id in before if product_id not in remaining]
+            for i, product_id, operation_index in targets:
+                if product_id not in remaining:
+                    results.append({"index": i, "_id": str(product_id), "status": "deleted"})
+                else:
+                    error = write_errors.get(operation_index) or general_error or "Delete was not applied"
+                    results.append({"index": i, "_id": str(product_id), "status": "failed", "error": error})
+            
+            deleted = counts.get('nRemoved', 0) if counts else len(removed)
+            apply_inventory_deltas(*(inventory_delta(before[product_id], -1) for product_id in removed))
+            suggest_index.remove(*removed)
+        
+        results.sort(key=lambda item: item['index'])
+        log_audit(AuditAction.BULK_DELETE, "products", details={
+            "mode": "ids" if 'ids' in data else "filter",
+            "total_attempted": len(data['ids']) if 'ids' in data else len(before),
+            "deleted": deleted,
+            "errors": sum(1 for item in results if item['status'] != 'deleted')
+        })
+        update_analytics("bulk_products_deleted", {"count": deleted})
+        collection_versions.bump('products')
+        mark_dashboard_dirty()
         
-        # Recent activity (last 7 days)
-        seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
-        recent_products = products_collection.count_documents({
-            "created_at": {"$gte": seven_days_ago}
+        return jsonify({
+            "message": "Bulk delete completed",
+            "deleted": deleted,
+            "results": results
         })
         
-        # Top viewed products
-        top_viewed = list(products_collection.find(
-            {"views": {"$gt": 0}},
-            {"name": 1, "views": 1, "price": 1}
-        ).sort("views", -1).limit(5))
-        
-        for product in top_viewed:
-            product['_id'] = str(product['_id'])
-        
-        # Price statistics
-        price_stats = list(products_collection.aggregate([
-            {
-                "$group": {
-                    "_id": None,
-                    "avg_price": {"$avg": "$price"},
-                    "min_price": {"$min": "$price"},
-                    "max_price": {"$max": "$price"},
-                    "total_inventory_value": {"$sum": {"$multiply": ["$price", "$quantity"]}}
-                }
-            }
-        ]))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# High-volume Import
+IMPORT_FORMATS = ('ndjson', 'csv')
+import_executor = ThreadPoolExecutor(max_workers=IMPORT_PARALLELISM, thread_name_prefix="import-insert")
+
+def iter_import_rows(path: str, format_type: str):
+    """Yield (row_number, row) pairs from an NDJSON or CSV file without loading it into memory"""
+    with open(path, newline='', encoding='utf-8') as handle:
+        if format_type == 'csv':
+            for row_number, row in enumerate(csv.DictReader(handle), start=1):
+                # Empty cells (and cells missing from short rows) are absent fields, not empty values
+                row = {key: value for key, value in row.items() if value not in ('', None)}
+                # CSV tags are semicolon separated
+                if isinstance(row.get('tags'), str):
+                    row['tags'] = row['tags'].split(';')
+                yield row_number, row
+        else:
+            for row_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    yield row_number, row if isinstance(row, dict) else ValueError("Row must be a JSON object")
+                except ValueError as e:
+                    yield row_number, e
+
+def record_import_progress(job_id: str, processed: int = 0, inserted: int = 0, errors: List[Dict] = None):
+    """Atomically add a chunk's results to the job status document"""
+    errors = errors or []
+    update = {"$inc": {"rows_processed": processed, "inserted": inserted, "failed": len(errors)}}
+    if errors:
+        update["$push"] = {"errors": {"$each": errors, "$slice": IMPORT_MAX_ERRORS}}
+    import_jobs_collection.update_one({"_id": job_id}, update)
+
+def insert_import_chunk(job_id: str, raw_rows: List[tuple], invalid: List[Dict],
+                        categories: Dict[ObjectId, Dict]) -> int:
+    """Validate one chunk column-wise, insert it unordered and record per-row failures"""
+    documents, row_errors = validate_product_batch([row for _, row in raw_rows], datetime.now(timezone.utc), categories)
+    rows = [(raw_rows[index][0], document) for index, document in documents]
+    documents = [document for _, document in rows]
+    errors = list(invalid)
+    errors.extend({"row": raw_rows[index][0], "errors": messages} for index, messages in row_errors)
+    failed_indexes = set()
+    
+    if documents:
+        try:
+            products_collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get('writeErrors', []):
+                failed_indexes.add(write_error['index'])
+                errors.append({"row": rows[write_error['index']][0], "errors": {"general": write_error.get('errmsg')}})
+        except Exception as e:
+            failed_indexes = set(range(len(documents)))
+            errors.extend({"row": row_number, "errors": {"general": str(e)}} for row_number, _ in rows)
+    
+    inserted = [document for index, document in enumerate(documents) if index not in failed_indexes]
+    apply_inventory_deltas(*(inventory_delta(document) for document in inserted))
+    suggest_index.add(*inserted)
+    record_import_progress(job_id, len(raw_rows) + len(invalid), len(inserted), errors)
+    if inserted:
+        collection_versions.bump('products')
+    return len(inserted)
+
+def run_import_job(job_id: str, path: str, format_type: str, chunk_size: int,
+                   user_ip: str = None, user_agent: str = None):
+    """Parse, validate and insert an uploaded file in parallel unordered chunks"""
+    import_jobs_collection.update_one(
+        {"_id": job_id}, {"$set": {"status": "running", "started_at": datetime.now(timezone.utc)}}
+    )
+    
+    try:
+        # Pre-pass: resolve every referenced category with one batched lookup
+        category_ids = {
+            ObjectId(row['category_id']) for _, row in iter_import_rows(path, format_type)
+            if isinstance(row, dict) and ObjectId.is_valid(str(row.get('category_id', '')))
+        }
+        categories = category_cache.get_many(category_ids)
+        
+        pending = set()
+        inserted_total = 0
+        raw_rows: List[tuple] = []
+        invalid: List[Dict] = []
+        
+        def submit_chunk():
+            nonlocal pending, inserted_total, raw_rows, invalid
+            # Bound the number of chunks in flight so memory stays flat
+            if len(pending) >= IMPORT_PARALLELISM * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                inserted_total += sum(future.result() for future in done)
+            # Validation runs in the worker too, keeping this thread to parsing and dispatch
+            pending.add(import_executor.submit(insert_import_chunk, job_id, raw_rows, invalid, categories))
+            raw_rows, invalid = [], []
+        
+        for row_number, row in iter_import_rows(path, format_type):
+            if isinstance(row, Exception):
+                invalid.append({"row": row_number, "errors": {"general": str(row)}})
+            else:
+                raw_rows.append((row_number, row))
+            
+            if len(raw_rows) + len(invalid) >= chunk_size:
+                submit_chunk()
         
-        price_data = price_stats[0] if price_stats else {}
+        if raw_rows or invalid:
+            submit_chunk()
+        inserted_total += sum(future.result() for future in wait(pending).done)
         
-        # Status distribution
-        status_pipeline = [
-            {
-                "$group": {
-                    "_id": "$status",
-                    "count": {"$sum": 1}
-                }
-            }
-        ]
+        job = import_jobs_collection.find_one_and_update(
+            {"_id": job_id},
+            {"$set": {"status": "completed", "finished_at": datetime.now(timezone.utc)}},
+            return_document=ReturnDocument.AFTER
+        )
+        
+        log_audit(AuditAction.BULK_CREATE, "products", details={
+            "import_job": job_id,
+            "total_attempted": job.get('rows_processed', 0),
+            "successful": inserted_total,
+            "errors": job.get('failed', 0)
+        }, user_ip=user_ip, user_agent=user_agent)
+        update_analytics("bulk_products_created", {"count": inserted_total})
+        mark_dashboard_dirty()
+        
+    except Exception as e:
+        print(f"Import job {job_id} failed: {e}")
+        import_jobs_collection.update_one(
+            {"_id": job_id},
+            {"$set": {"status": "failed", "error": str(e), "finished_at": datetime.now(timezone.utc)}}
+        )
+    finally:
+        os.unlink(path)
+
+@app.route('/api/products/import', methods=['POST'])
+def import_products():
+    """Start a background import of an NDJSON or CSV upload"""
+    if not mongo_connected:
+        return jsonify({"error": "Database not connected"}), 503
+    
+    try:
+        upload = request.files.get('file')
+        filename = upload.filename if upload else ''
+        format_type = request.args.get('format', '').lower()
+        if not format_type:
+            content_type = upload.mimetype if upload else (request.mimetype or '')
+            format_type = 'csv' if filename.lower().endswith('.csv') or 'csv' in content_type else 'ndjson'
+        if format_type not in IMPORT_FORMATS:
+            return jsonify({"error": f"format must be one of: {', '.join(IMPORT_FORMATS)}"}), 400
+        
+        chunk_size = request.args.get('chunk_size', IMPORT_CHUNK_SIZE, type=int)
+        if not chunk_size or chunk_size < 1 or chunk_size > 100000:
+            return jsonify({"error": "chunk_size must be between 1 and 100000"}), 400
+        
+        # Spool the upload to disk so the job can stream-parse it after the request ends
+        source = upload.stream if upload else request.stream
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{format_type}') as spool:
+            for block in iter(lambda: source.read(1024 * 1024), b''):
+                spool.write(block)
+            path = spool.name
+        
+        job_id = uuid.uuid4().hex
+        import_jobs_collection.insert_one({
+            "_id": job_id,
+            "status": "queued",
+            "format": format_type,
+            "filename": filename,
+            "chunk_size": chunk_size,
+            "rows_processed": 0,
+            "inserted": 0,
+            "failed": 0,
+            "errors": [],
+            "created_at": datetime.now(timezone.utc)
+        })
+        
+        threading.Thread(
+            target=run_import_job,
+            args=(job_id, path, format_type, chunk_size, request.remote_addr, request.headers.get('User-Agent', '')),
+            name=f"import-{job_id}",
+            daemon=True
+        ).start()
         
-        status_distribution = list(products_collection.aggregate(status_pipeline))
+        return jsonify({"job_id": job_id, "status": "queued", "status_url": f"/api/products/import/{job_id}"}), 202
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/products/import/<job_id>', methods=['GET'])
+def get_import_job(job_id):
+    """Get progress and per-row errors for an import job"""
+    if not mongo_connected:
+        return jsonify({"error": "Database not connected"}), 503
+    
+    try:
+        job = import_jobs_collection.find_one({"_id": job_id})
+        if not job:
+            return jsonify({"error": "Import job not found"}), 404
+        return jsonify(job)
         
-        # Convert ObjectIds to strings in status distribution
-        for item in status_distribution:
-            if '_id' in item and item['_id'] is not None:
-                item['_id'] = str(item['_id']) if hasattr(item['_id'], '__str__') else item['_id']
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Query planner report
+@app.route('/api/admin/query-report', methods=['GET'])
+def get_query_report():
+    """Explain() summaries per product query shape with compound index suggestions"""
+    if not mongo_connected:
+        return jsonify({"error": "Database not connected"}), 503
+    
+    try:
+        existing_indexes = [index['key'] for index in products_collection.index_information().values()]
+        return jsonify(query_planner.report(existing_indexes))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/admin/query-report', methods=['DELETE'])
+def reset_query_report():
+    """Forget collected plans, e.g. after creating suggested indexes"""
+    query_planner.reset()
+    return jsonify({"message": "Query report reset"})
+
+# Analytics Dashboard
+DASHBOARD_TOP_VIEWED_PROJECTION = {"name": 1, "views": 1, "price": 1}
+
+def dashboard_category_ids(stats: Dict) -> List[ObjectId]:
+    """Categories that currently hold products, according to the inventory counters"""
+    return [
+        ObjectId(category_id) for category_id, counters in stats.get('by_category', {}).items()
+        if counters.get('count', 0) > 0 and ObjectId.is_valid(category_id)
+    ]
+
+def compute_dashboard() -> Dict[str, Any]:
+    """Build the dashboard from inventory counters and index-backed queries"""
+    # Product statistics from the incrementally maintained counters
+    stats = load_inventory_stats()
+    
+    # Products by category (names resolved through the category cache)
+    categories = category_cache.get_many(dashboard_category_ids(stats))
+    
+    # Recent activity (last 7 days)
+    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    recent_products = products_collection.count_documents({
+        "created_at": {"$gte": seven_days_ago}
+    })
+    
+    # Top viewed products
+    top_viewed = list(products_collection.find(
+        {"views": {"$gt": 0}}, DASHBOARD_TOP_VIEWED_PROJECTION
+    ).sort("views", -1).limit(5))
+    
+    # Price extremes via the price index
+    cheapest = products_collection.find_one({}, {"price": 1}, sort=[("price", ASCENDING)])
+    priciest = products_collection.find_one({}, {"price": 1}, sort=[("price", DESCENDING)])
+    
+    return assemble_dashboard(
+        stats, categories, categories_collection.estimated_document_count(),
+        recent_products, top_viewed, cheapest, priciest
+    )
+
+def assemble_dashboard(stats: Dict, categories: Dict[ObjectId, Dict], total_categories: int,
+                       recent_products: int, top_viewed: List[Dict],
+                       cheapest: Optional[Dict], priciest: Optional[Dict]) -> Dict[str, Any]:
+    """Shape the dashboard response from the individual query results"""
+    total_products = stats.get('total_products', 0)
+    active_products = stats.get('active_products', 0)
+    
+    products_by_category = sorted([
+        {
+            "_id": category_id,
+            "category_name": categories[ObjectId(category_id)]['name'],
+            "count": counters['count'],
+            "total_value": counters.get('total_value', 0)
+        }
+        for category_id, counters in stats.get('by_category', {}).items()
+        if counters.get('count', 0) > 0 and ObjectId.is_valid(category_id) and ObjectId(category_id) in categories
+    ], key=lambda item: item['count'], reverse=True)
+    
+    # Price statistics: averages from counters, extremes from the price index
+    price_data = {
+        "avg_price": stats.get('price_sum', 0) / total_products if total_products else 0,
+        "min_price": cheapest['price'] if cheapest else 0,
+        "max_price": priciest['price'] if priciest else 0,
+        "total_inventory_value": stats.get('total_inventory_value', 0)
+    }
+    
+    # Status distribution
+    status_distribution = [
+        {"_id": status, "count": count}
+        for status, count in stats.get('by_status', {}).items() if count > 0
+    ]
+    
+    return {
+        "summary": {
+            "total_products": total_products,
+            "active_products": active_products,
+            "total_categories": total_categories,
+            "recent_products": recent_products,
+            "avg_price": round(price_data.get('avg_price', 0), 2),
+            "total_inventory_value": round(price_data.get('total_inventory_value', 0), 2)
+        },
+        "charts": {
+            "products_by_category": products_by_category,
+            "status_distribution": status_distribution,
+            "top_viewed_products": top_viewed
+        },
+        "price_stats": {
+            "average": round(price_data.get('avg_price', 0), 2),
+            "minimum": price_data.get('min_price', 0),
+            "maximum": price_data.get('max_price', 0)
+        }
+    }
+
+def refresh_dashboard_snapshot() -> Dict[str, Any]:
+    """Recompute the dashboard and store it as the materialized snapshot"""
+    computed_at = datetime.now(timezone.utc)
+    snapshot = {"_id": DASHBOARD_SNAPSHOT_ID, "data": compute_dashboard(), "computed_at": computed_at}
+    dashboard_collection.replace_one({"_id": DASHBOARD_SNAPSHOT_ID}, snapshot, upsert=True)
+    collection_versions.bump('dashboard')
+    return snapshot
+
+def snapshot_age_seconds(snapshot: Dict) -> float:
+    """Seconds since the snapshot was computed"""
+    # Documents read back from MongoDB carry naive UTC datetimes
+    computed_at = snapshot['computed_at'].replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - computed_at).total_seconds()
+
+class DashboardRefresher(BackgroundWorker):
+    """Background thread that keeps the dashboard snapshot fresh on an interval or when marked dirty"""
+    
+    thread_name = "dashboard-refresher"
+    
+    def __init__(self, interval: float, min_interval: float):
+        super().__init__()
+        self.interval = interval
+        self.min_interval = min_interval
+        self._dirty = threading.Event()
+        self.refreshes = 0
+    
+    def mark_dirty(self):
+        """Schedule a recompute after a write (coalesced to at most one per min_interval)"""
+        self.ensure_started()
+        self._dirty.set()
+    
+    def _run(self):
+        while True:
+            dirty = self._dirty.wait(self.interval)
+            self._dirty.clear()
+            try:
+                # Other workers may already have refreshed the shared snapshot
+                snapshot = dashboard_collection.find_one({"_id": DASHBOARD_SNAPSHOT_ID}, {"computed_at": 1})
+                if dirty or not snapshot or snapshot_age_seconds(snapshot) >= self.interval:
+                    refresh_dashboard_snapshot()
+                    self.refreshes += 1
+            except Exception as e:
+                print(f"Dashboard refresh failed: {e}")
+            time.sleep(self.min_interval)
+
+dashboard_refresher = DashboardRefresher(DASHBOARD_REFRESH_INTERVAL, DASHBOARD_MIN_REFRESH_INTERVAL)
+
+def mark_dashboard_dirty():
+    """Ask the refresher to recompute the dashboard after a write"""
+    if mongo_connected:
+        dashboard_refresher.mark_dirty()
+
+@app.route('/api/analytics/dashboard', methods=['GET'])
+def get_dashboard_analytics():
+    """Get analytics data for dashboard from the materialized snapshot"""
+    if not mongo_connected:
+        return jsonify({"error": "Database not connected"}), 503
+    
+    try:
+        dashboard_refresher.ensure_started()
+        
+        fresh = request.args.get('fresh', '').lower() in ('1', 'true')
+        dashboard_version, dashboard_updated = collection_versions.get('dashboard')
+        etag = f"dashboard-{dashboard_version}"
+        if not fresh and dashboard_version:
+            not_modified = not_modified_response(etag, dashboard_updated, 'dashboard')
+            if not_modified:
+                return not_modified
+        
+        snapshot = None if fresh else dashboard_collection.find_one({"_id": DASHBOARD_SNAPSHOT_ID})
+        if not snapshot:
+            snapshot = refresh_dashboard_snapshot()
+            dashboard_version, dashboard_updated = collection_versions.get('dashboard')
+            etag = f"dashboard-{dashboard_version}"
         
         log_audit(AuditAction.READ, "analytics")
         
-        return jsonify({
-            "summary": {
-                "total_products": total_products,
-                "active_products": active_products,
-                "total_categories": total_categories,
-                "recent_products": recent_products,
-                "avg_price": round(price_data.get('avg_price', 0), 2),
-                "total_inventory_value": round(price_data.get('total_inventory_value', 0), 2)
-            },
-            "charts": {
-                "products_by_category": products_by_category,
-                "status_distribution": status_distribution,
-                "top_viewed_products": top_viewed
-            },
-            "price_stats": {
-                "average": round(price_data.get('avg_price', 0), 2),
-                "minimum": price_data.get('min_price', 0),
-                "maximum": price_data.get('max_price', 0)
-            }
+        response = jsonify({
+            **snapshot['data'],
+            "computed_at": snapshot['computed_at'],
+            "staleness_seconds": round(snapshot_age_seconds(snapshot), 3)
         })
+        return with_cache_headers(response, etag, dashboard_updated, 'dashboard')
         
     except Exception as e:
         print(f"Analytics dashboard error: {e}")
@@ -805,81 +3408,294 @@ def get_dashboard_analytics():
         return jsonify({"error": str(e)}), 500
 
 # Data Export
+EXPORT_FIELDS = ['_id', 'name', 'description', 'category_name', 'price', 'quantity', 'status', 'tags', 'created_at', 'views']
+EXPORT_FORMATS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+def export_pipeline() -> List[Dict]:
+    """Products joined with their category name, in export column order"""
+    return [
+        {
+            "$lookup": {
+                "from": "categories",
+                "localField": "category_id",
+                "foreignField": "_id",
+                "as": "category"
+            }
+        },
+        {
+            "$unwind": "$category"
+        },
+        {
+            "$project": {
+                "name": 1,
+                "description": 1,
+                "category_name": "$category.name",
+                "price": 1,
+                "quantity": 1,
+                "status": 1,
+                "tags": 1,
+                "created_at": 1,
+                "views": 1
+            }
+        }
+    ]
+
+def csv_export_row(product: Dict) -> Dict:
+    """CSV cells are str()-ed, so give dates their ISO form explicitly"""
+    if isinstance(product.get('created_at'), datetime):
+        product['created_at'] = encode_bson_value(product['created_at'])
+    return product
+
+def export_chunks(format_type: str, exported_at: datetime):
+    """Yield the export body in ~EXPORT_CHUNK_BYTES text chunks while iterating the cursor"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+    count = 0
+    
+    if format_type == 'csv':
+        writer.writeheader()
+    elif format_type == 'json':
+        buffer.write('{"data": [')
+    
+    cursor = products_collection.aggregate(export_pipeline(), batchSize=EXPORT_BATCH_SIZE)
+    try:
+        for product in cursor:
+            if format_type == 'csv':
+                writer.writerow(csv_export_row(product))
+            elif format_type == 'ndjson':
+                buffer.write(app.json.dumps(product) + '\n')
+            else:
+                buffer.write((', ' if count else '') + app.json.dumps(product))
+            count += 1
+            
+            if buffer.tell() >= EXPORT_CHUNK_BYTES:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    finally:
+        cursor.close()
+    
+    if format_type == 'json':
+        buffer.write(f'], "count": {count}, "exported_at": "{exported_at.isoformat()}", "format": "json"}}')
+    yield buffer.getvalue()
+    
+    log_audit(AuditAction.READ, "export", details={"format": format_type, "count": count})
+
+def gzip_chunks(chunks):
+    """Gzip-compress a stream of text chunks incrementally"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk.encode('utf-8'))
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
 @app.route('/api/export/products', methods=['GET'])
 def export_products():
-    """Export products data"""
+    """Stream products data as JSON, NDJSON or CSV (optionally gzip-compressed)"""
     if not mongo_connected:
         return jsonify({"error": "Database not connected"}), 503
     
     try:
         format_type = request.args.get('format', 'json')
+        if format_type not in EXPORT_FORMATS:
+            return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+        compress = request.args.get('gzip', '').lower() in ('1', 'true')
         
-        # Get all products with category info
-        pipeline = [
-            {
-                "$lookup": {
-                    "from": "categories",
-                    "localField": "category_id",
-                    "foreignField": "_id",
-                    "as": "category"
-                }
-            },
-            {
-                "$unwind": "$category"
-            },
-            {
-                "$project": {
-                    "name": 1,
-                    "description": 1,
-                    "category_name": "$category.name",
-                    "price": 1,
-                    "quantity": 1,
-                    "status": 1,
-                    "tags": 1,
-                    "created_at": 1,
-                    "views": 1
-                }
-            }
-        ]
-        
-        products = list(products_collection.aggregate(pipeline))
-        
-        for product in products:
-            product['_id'] = str(product['_id'])
-            product['created_at'] = product['created_at'].isoformat()
-        
-        log_audit(AuditAction.READ, "export", details={"format": format_type, "count": len(products)})
+        now = datetime.now(timezone.utc)
+        headers = {}
+        if format_type != 'json':
+            headers['Content-Disposition'] = f'attachment; filename=products_{now.strftime("%Y%m%d_%H%M%S")}.{format_type}'
         
-        if format_type == 'csv':
-            # Convert to CSV format
-            import csv
-            import io
-            
-            output = io.StringIO()
-            if products:
-                fieldnames = products[0].keys()
-                writer = csv.DictWriter(output, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(products)
-            
-            now = datetime.now(timezone.utc)
-            return output.getvalue(), 200, {
-                'Content-Type': 'text/csv',
-                'Content-Disposition': f'attachment; filename=products_{now.strftime("%Y%m%d_%H%M%S")}.csv'
-            }
+        body = export_chunks(format_type, now)
+        if compress:
+            body = gzip_chunks(body)
+            headers['Content-Encoding'] = 'gzip'
         
-        return jsonify({
-            "data": products,
-            "count": len(products),
-            "exported_at": now.isoformat(),
-            "format": format_type
-        })
+        return Response(stream_with_context(body), mimetype=EXPORT_FORMATS[format_type], headers=headers)
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Schema migrations: versioned, idempotent, applied once per deploy with `flask --app app migrate`
+def migrate_initial_indexes():
+    """Indexes previously created by every process at import time"""
+    products_collection.create_index([("name", "text"), ("description", "text"), ("tags", "text")])
+    products_collection.create_index([("category_id", ASCENDING)])
+    products_collection.create_index([("created_at", DESCENDING)])
+    products_collection.create_index([("price", ASCENDING)])
+    products_collection.create_index([("views", DESCENDING)])
+    
+    audit_collection.create_index([("timestamp", DESCENDING)])
+    audit_collection.create_index([("action", ASCENDING)])
+    audit_read_collection.create_index([("minute", DESCENDING), ("resource_type", ASCENDING)], unique=True)
+    import_jobs_collection.create_index([("created_at", DESCENDING)])
+    
+    analytics_hourly_collection.create_index([("action", ASCENDING), ("bucket", ASCENDING)], unique=True)
+    analytics_hourly_collection.create_index([("bucket", ASCENDING)])
+    analytics_daily_collection.create_index([("action", ASCENDING), ("bucket", ASCENDING)], unique=True)
+    analytics_daily_collection.create_index(
+        [("bucket", ASCENDING)], expireAfterSeconds=ANALYTICS_DAILY_RETENTION_DAYS * 86400
+    )
+
+def migrate_sort_indexes():
+    """Product list sorts include _id as a tie-breaker, which single-field indexes cannot serve"""
+    products_collection.create_index([("created_at", DESCENDING), ("_id", DESCENDING)])
+    products_collection.create_index([("price", ASCENDING), ("_id", ASCENDING)])
+    products_collection.create_index([("views", DESCENDING), ("_id", DESCENDING)])
+    for superseded in ("created_at_-1", "price_1", "views_-1"):
+        try:
+            products_collection.drop_index(superseded)
+        except OperationFailure:
+            pass  # already dropped
+
+def migrate_weighted_text_index():
+    """Rebuild the text index with field weights so name and tag matches outrank descriptions"""
+    for name, index in products_collection.index_information().items():
+        if 'textIndexVersion' in index and index.get('weights') != TEXT_INDEX_WEIGHTS:
+            products_collection.drop_index(name)
+    products_collection.create_index(
+        [("name", "text"), ("description", "text"), ("tags", "text")],
+        weights=TEXT_INDEX_WEIGHTS,
+        name="product_text"
+    )
+
+def migrate_category_sort_index():
+    """Category listings page through categories by name"""
+    categories_collection.create_index(CATEGORY_SORT)
+
+def backfill_category_names() -> Dict[str, List[str]]:
+    """Set name_normalized on categories that lack it; return names that collide after normalization"""
+    operations = [
+        UpdateOne({"_id": category['_id']}, {"$set": {"name_normalized": normalize_category_name(category['name'])}})
+        for category in categories_collection.find({"name_normalized": {"$exists": False}}, {"name": 1})
+    ]
+    if operations:
+        categories_collection.bulk_write(operations, ordered=False)
+    
+    groups: Dict[str, List[str]] = {}
+    for category in categories_collection.find({}, {"name": 1, "name_normalized": 1}):
+        groups.setdefault(category['name_normalized'], []).append(category['name'])
+    return {normalized: names for normalized, names in groups.items() if len(names) > 1}
+
+def migrate_unique_category_names():
+    """Replace the regex duplicate check with a unique case-insensitive index on name_normalized"""
+    duplicates = backfill_category_names()
+    if duplicates:
+        listing = "; ".join(", ".join(names) for names in duplicates.values())
+        raise RuntimeError(f"Rename or merge duplicate categories before migrating: {listing}")
+    categories_collection.create_index(
+        [("name_normalized", ASCENDING)],
+        unique=True,
+        collation=CATEGORY_NAME_COLLATION,
+        # Rows written by not-yet-upgraded workers during a rolling deploy must not collide as nulls
+        partialFilterExpression={"name_normalized": {"$exists": True}}
+    )
+
+def migrate_seed_inventory_stats():
+    """Seed the inventory counters from a full recount of existing products"""
+    reconcile_inventory_stats()
+
+# Append only; a migration's version is recorded in schema_migrations once it succeeds
+MIGRATIONS = [
+    (1, "initial indexes", migrate_initial_indexes),
+    (2, "product sort indexes with _id tie-breaker", migrate_sort_indexes),
+    (3, "weighted product text index", migrate_weighted_text_index),
+    (4, "category name index", migrate_category_sort_index),
+    (5, "unique normalized category names", migrate_unique_category_names),
+    (6, "seed inventory counters", migrate_seed_inventory_stats),
+]
+
+def pending_migrations() -> List[tuple]:
+    applied = {document['_id'] for document in migrations_collection.find({}, {"_id": 1})}
+    return [migration for migration in MIGRATIONS if migration[0] not in applied]
+
+def run_migrations() -> List[int]:
+    """Apply pending migrations in order; safe to run concurrently since each step is idempotent"""
+    ran = []
+    for version, description, migrate in pending_migrations():
+        started = time.monotonic()
+        migrate()
+        migrations_collection.update_one(
+            {"_id": version},
+            {"$setOnInsert": {
+                "description": description,
+                "applied_at": datetime.now(timezone.utc),
+                "duration_seconds": round(time.monotonic() - started, 3)
+            }},
+            upsert=True
+        )
+        print(f"✅ Applied migration {version}: {description}")
+        ran.append(version)
+    return ran
+
+# Maintenance Commands
+@app.cli.command('migrate')
+@click.option('--status', 'show_status', is_flag=True, help='List pending migrations without applying them')
+def migrate_command(show_status):
+    """Apply pending schema migrations (indexes); run once per deploy"""
+    if show_status:
+        pending = pending_migrations()
+        for version, description, _ in pending:
+            print(f"pending {version}: {description}")
+        print(f"{len(pending)} pending of {len(MIGRATIONS)} migrations")
+        return
+    ran = run_migrations()
+    if not ran:
+        print("✅ Schema is up to date")
+
+@app.cli.command('compact-analytics')
+def compact_analytics_command():
+    """Roll old hourly analytics into daily buckets (run from cron)"""
+    print(compact_analytics())
+
+@app.cli.command('reconcile-inventory')
+@click.option('--dry-run', is_flag=True, help='Report drift without repairing it')
+def reconcile_inventory_command(dry_run):
+    """Verify the inventory counters against a full recount and repair drift"""
+    drift = reconcile_inventory_stats(repair=not dry_run)
+    if not drift:
+        print("✅ Inventory counters are consistent")
+        return
+    for field, values in sorted(drift.items()):
+        print(f"{field}: stored={values['stored']} actual={values['actual']}")
+    print(f"{'⚠️ Found' if dry_run else '🔧 Repaired'} {len(drift)} drifted counters")
+
+@app.cli.command('backfill-category-names')
+def backfill_category_names_command():
+    """Populate name_normalized for existing categories and list names that collide"""
+    duplicates = backfill_category_names()
+    if not duplicates:
+        print("✅ Category names are unique")
+        return
+    for normalized, names in sorted(duplicates.items()):
+        print(f"{normalized}: {', '.join(names)}")
+    print(f"⚠️ Found {len(duplicates)} duplicate category names; resolve them, then run migrate")
+
+# Production entry point
+def create_app():
+    """Application factory for WSGI servers, e.g. gunicorn -c gunicorn.conf.py 'app:create_app()'"""
+    if _mongo_pid != os.getpid():
+        init_mongo()
+    start_category_watch()
+    suggest_index.ensure_started()
+    return app
+
+def migrate_when_connected():
+    """Development convenience: apply pending migrations once Mongo is reachable"""
+    mongo_health.wait()
+    try:
+        run_migrations()
+    except Exception as e:
+        print(f"Migration failed: {e}")
+
 if __name__ == '__main__':
     print("🚀 Starting Professional CRUD Application...")
     print(f"📊 Database: {DATABASE_NAME}")
-    print(f"🔗 MongoDB: {'Connected' if mongo_connected else 'Disconnected'}")
-    app.run(debug=False, host='0.0.0.0', port=5000)
\ No newline at end of file
+    print("⚠️  Development server; use gunicorn -c gunicorn.conf.py for production")
+    threading.Thread(target=migrate_when_connected, name="migrate", daemon=True).start()
+    app.run(debug=False, host=os.getenv('HOST', '0.0.0.0'), port=int(os.getenv('PORT', 5000)), threaded=True)
@@ -0,0 +1,342 @@
+"""
+Async edition of the Product Management API (Quart + Motor)
+
+Read routes whose latency is dominated by MongoDB round trips run natively on
+asyncio, with independent queries overlapped through asyncio.gather. Every other
+route is served by the WSGI application in app.py on a thread pool, so both
+editions expose the same routes and response shapes and share the caches,
+audit pipeline and view counter.
+
+    uvicorn async_app:asgi_app --host 0.0.0.0 --port 5000 --workers 4
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from a2wsgi import WSGIMiddleware
+from bson.objectid import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from quart import Quart, Response, jsonify, request
+from werkzeug.exceptions import HTTPException
+
+import app as crud_app
+from app import AuditAction, log_audit, with_cache_headers
+
+WSGI_FALLBACK_THREADS = int(os.getenv('WSGI_FALLBACK_THREADS', 16))
+
+app = Quart(__name__, static_folder=None)
+app.json_provider_class = crud_app.select_json_provider()
+app.json = app.json_provider_class(app)
+
+# Routes not implemented here (writes, bulk, import, export, pages) go to the WSGI app
+wsgi_fallback = WSGIMiddleware(crud_app.app, workers=WSGI_FALLBACK_THREADS)
+
+def _set_mongo_connected(connected: bool):
+    global mongo_connected
+    mongo_connected = connected
+
+async_pool_metrics = crud_app.PoolMetrics()
+async_mongo_health = crud_app.MongoHealth(on_change=_set_mongo_connected)
+client: Optional[AsyncIOMotorClient] = None
+db = None
+mongo_connected = False
+
+@app.before_serving
+async def connect_mongo():
+    """Create the Motor client inside the serving event loop (after any worker fork); never waits for the server"""
+    global client, db
+    client = AsyncIOMotorClient(
+        crud_app.MONGO_URI,
+        **{**crud_app.mongo_client_options(), "event_listeners": [async_pool_metrics, async_mongo_health]}
+    )
+    db = client[crud_app.DATABASE_NAME]
+    # The suggest index builds with the sync client on its own thread, off the event loop
+    crud_app.suggest_index.ensure_started()
+
+@app.after_serving
+async def close_mongo():
+    if client is not None:
+        client.close()
+
+@app.after_request
+async def add_cors_headers(response):
+    """Mirror the Flask-CORS defaults of the WSGI app"""
+    if request.headers.get('Origin'):
+        response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+# Async counterparts of the shared helpers in app.py
+def not_modified_response(etag: str, last_modified: Optional[datetime], policy: str, weak: bool = True):
+    """Return a 304 response when the request's validators still match, else None"""
+    if request.if_none_match:
+        matches = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified:
+        matches = last_modified.replace(microsecond=0) <= request.if_modified_since
+    else:
+        matches = False
+
+    if not matches:
+        return None
+    return with_cache_headers(Response("", status=304), etag, last_modified, policy, weak)
+
+def audit_read(resource_type: str, resource_id: str = None):
+    log_audit(AuditAction.READ, resource_type, resource_id,
+              user_ip=request.remote_addr, user_agent=request.headers.get('User-Agent', ''))
+
+async def collection_version(name: str) -> tuple:
+    """Async read of the shared collection version cache (see CollectionVersions.get)"""
+    versions = crud_app.collection_versions
+    if versions.is_stale():
+        try:
+            versions.merge(await db.collection_versions.find({}).to_list(None))
+        except Exception as e:
+            print(f"Collection version refresh failed: {e}")
+    return versions.cached(name)
+
+async def bump_collection_version(name: str):
+    now = datetime.now(timezone.utc)
+    try:
+        document = await db.collection_versions.find_one_and_update(
+            {"_id": name},
+            {"$inc": {"version": 1}, "$set": {"updated_at": now}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        crud_app.collection_versions.record(name, document['version'], now)
+    except Exception as e:
+        print(f"Collection version bump failed: {e}")
+
+async def get_categories_cached(category_ids) -> Dict[ObjectId, Dict]:
+    """CategoryCache.get_many with the misses loaded through Motor"""
+    found, missing = crud_app.category_cache.lookup(category_ids)
+    if missing:
+        loaded = await db.categories.find(
+            {"_id": {"$in": missing}}, crud_app.CATEGORY_SUMMARY_PROJECTION
+        ).to_list(None)
+        found.update(crud_app.category_cache.store(loaded))
+    return found
+
+async def embed_categories(products: List[Dict]) -> List[Dict]:
+    category_ids = [product['category_id'] for product in products if product.get('category_id') is not None]
+    return crud_app.embed_categories(products, await get_categories_cached(category_ids))
+
+# Routes
+@app.route('/health')
+async def health_check():
+    """Health check endpoint"""
+    return jsonify({
+        "status": "healthy" if mongo_connected else "degraded",
+        "mongodb_connected": mongo_connected,
+        "mongodb": async_mongo_health.stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "category_cache": crud_app.category_cache.stats(),
+        "audit": crud_app.audit_writer.stats(),
+        "views": crud_app.view_counter.stats(),
+        "response_cache": crud_app.response_cache.stats(),
+        "suggest": crud_app.suggest_index.stats(),
+        "mongo_pool": crud_app.pool_metrics.stats(),
+        "async_mongo_pool": async_pool_metrics.stats()
+    })
+
+@app.route('/api/categories', methods=['GET'])
+async def get_categories():
+    """Get all categories with product counts"""
+    if not mongo_connected:
+        return jsonify({"error": "Database not connected"}), 503
+
+    try:
+        try:
+            paginated, page, limit = crud_app.parse_category_page(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        (categories_version, categories_updated), (products_version, products_updated) = await asyncio.gather(
+            collection_version('categories'), collection_version('products')
+        )
+        etag = f"categories-{categories_version}-{products_version}"
+        if paginated:
+            etag += f"-{page}-{limit}"
+        last_modified = crud_app.latest(categories_updated, products_updated)
+        not_modified = not_modified_response(etag, last_modified, 'categories')
+        if not_modified:
+            return not_modified
+
+        cursor = db.categories.find({}, crud_app.CATEGORY_PUBLIC_PROJECTION).sort(crud_app.CATEGORY_SORT)
+        if paginated:
+            cursor = cursor.skip((page - 1) * limit).limit(limit + 1)
+        categories, stats, total_count = await asyncio.gather(
+            cursor.to_list(None),
+            load_inventory_stats(),
+            db.categories.estimated_document_count() if paginated else asyncio.sleep(0)
+        )
+        crud_app.with_product_counts(categories, stats)
+
+        audit_read("categories")
+        if paginated:
+            body = crud_app.category_page(categories, page, limit, total_count)
+            return with_cache_headers(jsonify(body), etag, last_modified, 'categories')
+        return with_cache_headers(jsonify(categories), etag, last_modified, 'categories')
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/products/suggest', methods=['GET'])
+async def suggest_products():
+    """Typeahead: top-K products whose name or tags match the typed prefix, without a database round trip"""
+    if not crud_app.suggest_index.ready:
+        if not mongo_connected:
+            return jsonify({"error": "Database not connected"}), 503
+        crud_app.suggest_index.ensure_started()
+        return jsonify({"error": "Suggest index is building"}), 503, {"Retry-After": "1"}
+
+    try:
+        text = request.args.get('q', '').strip()
+        limit = min(max(request.args.get('limit', crud_app.SUGGEST_LIMIT, type=int), 1), crud_app.SUGGEST_MAX_LIMIT)
+        started = time.perf_counter()
+        suggestions = crud_app.suggest_index.search(text, limit)
+        return jsonify({
+            "query": text,
+            "suggestions": suggestions,
+            "took_ms": round((time.perf_counter() - started) * 1000, 3)
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/products/<product_id>', methods=['GET'])
+async def get_product(product_id):
+    """Get a single product by ID"""
+    if not mongo_connected:
+        return jsonify({"error": "Database not connected"}), 503
+
+    try:
+        categories_version, categories_updated = await collection_version('categories')
+
+        # Revalidation only needs the validator fields, so skip the full document and category join
+        if request.if_none_match or request.if_modified_since:
+            current = await db.products.find_one(
+                {"_id": ObjectId(product_id)}, {"version": 1, "views": 1, "updated_at": 1, "last_viewed": 1}
+            )
+            if current:
+                not_modified = not_modified_response(
+                    crud_app.version_etag(current, categories_version),
+                    crud_app.product_last_modified(current, categories_updated), 'product', weak=False
+                )
+                if not_modified:
+                    crud_app.view_counter.record(current['_id'])
+                    return not_modified
+
+        product = await db.products.find_one({"_id": ObjectId(product_id)})
+        if not product:
+            return jsonify({"error": "Product not found"}), 404
+
+        crud_app.view_counter.record(product['_id'])
+        await embed_categories([product])
+
+        audit_read("product", product_id)
+        return with_cache_headers(
+            jsonify(product), crud_app.version_etag(product, categories_version),
+            crud_app.product_last_modified(product, categories_updated), 'product', weak=False
+        )
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Analytics Dashboard
+async def load_inventory_stats() -> Dict[str, Any]:
+    stats = await db.inventory_stats.find_one({"_id": crud_app.INVENTORY_STATS_ID})
+    if not stats:
+        # Seeding is a one-off full recount; keep it off the event loop
+        await asyncio.to_thread(crud_app.reconcile_inventory_stats)
+        stats = await db.inventory_stats.find_one({"_id": crud_app.INVENTORY_STATS_ID}) or {}
+    return stats
+
+async def load_inventory_stats_with_categories() -> tuple:
+    stats = await load_inventory_stats()
+    return stats, await get_categories_cached(crud_app.dashboard_category_ids(stats))
+
+async def compute_dashboard() -> Dict[str, Any]:
+    """Run the dashboard queries concurrently; latency tracks the slowest one rather than the sum"""
+    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    (stats, categories), total_categories, recent_products, top_viewed, cheapest, priciest = await asyncio.gather(
+        load_inventory_stats_with_categories(),
+        db.categories.estimated_document_count(),
+        db.products.count_documents({"created_at": {"$gte": seven_days_ago}}),
+        db.products.find(
+            {"views": {"$gt": 0}}, crud_app.DASHBOARD_TOP_VIEWED_PROJECTION
+        ).sort("views", -1).limit(5).to_list(5),
+        db.products.find_one({}, {"price": 1}, sort=[("price", ASCENDING)]),
+        db.products.find_one({}, {"price": 1}, sort=[("price", DESCENDING)])
+    )
+    return crud_app.assemble_dashboard(
+        stats, categories, total_categories, recent_products, top_viewed, cheapest, priciest
+    )
+
+async def refresh_dashboard_snapshot() -> Dict[str, Any]:
+    computed_at = datetime.now(timezone.utc)
+    snapshot = {"_id": crud_app.DASHBOARD_SNAPSHOT_ID, "data": await compute_dashboard(), "computed_at": computed_at}
+    await db.dashboard_snapshots.replace_one({"_id": crud_app.DASHBOARD_SNAPSHOT_ID}, snapshot, upsert=True)
+    await bump_collection_version('dashboard')
+    return snapshot
+
+@app.route('/api/analytics/dashboard', methods=['GET'])
+async def get_dashboard_analytics():
+    """Get analytics data for dashboard from the materialized snapshot"""
+    if not mongo_connected:
+        return jsonify({"error": "Database not connected"}), 503
+
+    try:
+        crud_app.dashboard_refresher.ensure_started()
+
+        fresh = request.args.get('fresh', '').lower() in ('1', 'true')
+        dashboard_version, dashboard_updated = await collection_version('dashboard')
+        etag = f"dashboard-{dashboard_version}"
+        if not fresh and dashboard_version:
+            not_modified = not_modified_response(etag, dashboard_updated, 'dashboard')
+            if not_modified:
+                return not_modified
+
+        snapshot = None if fresh else await db.dashboard_snapshots.find_one({"_id": crud_app.DASHBOARD_SNAPSHOT_ID})
+        if not snapshot:
+            snapshot = await refresh_dashboard_snapshot()
+            dashboard_version, dashboard_updated = crud_app.collection_versions.cached('dashboard')
+            etag = f"dashboard-{dashboard_version}"
+
+        audit_read("analytics")
+
+        response = jsonify({
+            **snapshot['data'],
+            "computed_at": snapshot['computed_at'],
+            "staleness_seconds": round(crud_app.snapshot_age_seconds(snapshot), 3)
+        })
+        return with_cache_headers(response, etag, dashboard_updated, 'dashboard')
+
+    except Exception as e:
+        print(f"Analytics dashboard error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+def handles(scope: Dict) -> bool:
+    """Whether the Flask route for this request has a native async version (preflights stay with Flask-CORS)"""
+    if scope['method'] == 'OPTIONS':
+        return False
+    try:
+        # Flask's map decides, so static rules such as /api/products/search beat /api/products/<product_id>
+        endpoint, _ = crud_app.app.url_map.bind('').match(scope['path'], method=scope['method'])
+    except HTTPException:
+        return False
+    return endpoint in app.view_functions
+
+async def asgi_app(scope, receive, send):
+    """ASGI entry point: native async routes first, the WSGI app for everything else"""
+    if scope['type'] == 'http' and not handles(scope):
+        await wsgi_fallback(scope, receive, send)
+    else:
+        await app(scope, receive, send)
+
+if __name__ == '__main__':
+    import uvicorn
+    print("🚀 Starting Professional CRUD Application (async)...")
+    uvicorn.run(asgi_app, host=os.getenv('HOST', '0.0.0.0'), port=int(os.getenv('PORT', 5000)))
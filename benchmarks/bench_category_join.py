@@ -0,0 +1,110 @@
+"""
+Benchmark: category embedding for product list pages
+Compares the legacy per-product find_one join with the batched $in join
+used by embed_categories (cold and warm category cache), for a range of
+page sizes.
+
+Requires a running MongoDB at MONGO_URI (defaults to localhost).
+Usage: python benchmarks/bench_category_join.py [--rounds 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as crud_app
+
+BENCH_DATABASE = 'professional_crud_bench'
+PAGE_SIZES = [10, 25, 50, 100]
+CATEGORY_COUNT = 20
+PRODUCT_COUNT = 1000
+
+
+def seed(db):
+    """Create a fresh catalog in the benchmark database"""
+    db.categories.drop()
+    db.products.drop()
+    now = datetime.now(timezone.utc)
+    category_ids = db.categories.insert_many([
+        {"name": f"Category {i}", "color": "#007bff", "icon": "fas fa-box", "created_at": now, "updated_at": now}
+        for i in range(CATEGORY_COUNT)
+    ]).inserted_ids
+    db.products.insert_many([
+        {
+            "name": f"Product {i}",
+            "description": "Benchmark product description",
+            "category_id": category_ids[i % CATEGORY_COUNT],
+            "price": 10.0 + i,
+            "quantity": i % 50,
+            "tags": ["bench"],
+            "status": "active",
+            "created_at": now,
+            "updated_at": now,
+            "views": 0,
+            "last_viewed": None
+        }
+        for i in range(PRODUCT_COUNT)
+    ])
+
+
+def legacy_join(products, categories_collection):
+    """The pre-batching behaviour: one find_one per product"""
+    for product in products:
+        product['_id'] = str(product['_id'])
+        product['category_id'] = str(product['category_id'])
+        category = categories_collection.find_one({"_id": crud_app.ObjectId(product['category_id'])})
+        if category:
+            product['category'] = crud_app.category_summary(category)
+    return products
+
+
+def batched_join(products):
+    """Batched join with an empty category cache: exactly one $in round trip"""
+    crud_app.category_cache.invalidate()
+    return crud_app.embed_categories(products)
+
+
+def time_join(join, products_collection, limit, rounds):
+    """Return the median latency in milliseconds of fetching and joining one page"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        page = list(products_collection.find({}).sort("created_at", -1).limit(limit))
+        join(page)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    if not crud_app.mongo_health.wait(crud_app.MONGO_SERVER_SELECTION_TIMEOUT_MS / 1000):
+        print("MongoDB is not reachable; start mongod and retry")
+        return 1
+
+    db = crud_app.client[BENCH_DATABASE]
+    seed(db)
+
+    # Point the app helpers at the benchmark collections
+    crud_app.categories_collection = db.categories
+
+    print(f"{'page size':>10} {'before (ms)':>12} {'batched (ms)':>13} {'cached (ms)':>12} {'speedup':>8}")
+    for limit in PAGE_SIZES:
+        before = time_join(lambda page: legacy_join(page, db.categories), db.products, limit, args.rounds)
+        batched = time_join(batched_join, db.products, limit, args.rounds)
+        cached = time_join(crud_app.embed_categories, db.products, limit, args.rounds)
+        print(f"{limit:>10} {before:>12.2f} {batched:>13.2f} {cached:>12.2f} {before / batched:>7.1f}x")
+
+    crud_app.client.drop_database(BENCH_DATABASE)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Benchmark: JSON serialization of product documents
+Compares the legacy per-document conversion loop followed by Flask's default
+provider with the BSON-aware providers (stdlib and orjson backends) for
+1k and 10k product documents.
+
+Runs without MongoDB; documents are generated in memory.
+Usage: python benchmarks/bench_json_serialization.py [--rounds 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson.decimal128 import Decimal128
+from bson.objectid import ObjectId
+from flask.json.provider import DefaultJSONProvider
+
+import app as crud_app
+
+DOCUMENT_COUNTS = [1000, 10000]
+
+
+def make_products(count):
+    """Build product documents shaped like the ones read from MongoDB"""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    category_id = ObjectId()
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Product {i}",
+            "description": "Benchmark product description",
+            "category_id": category_id,
+            "price": 10.0 + i,
+            "cost": Decimal128(f"{i}.25"),
+            "quantity": i % 50,
+            "tags": ["bench", "json"],
+            "status": "active",
+            "created_at": now,
+            "updated_at": now,
+            "views": i,
+            "last_viewed": None,
+            "category": {"_id": category_id, "name": "Bench", "color": "#007bff", "icon": "fas fa-box"}
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_serialize(provider, products):
+    """The pre-provider behaviour: convert every BSON value by hand, then dump"""
+    for product in products:
+        product['_id'] = str(product['_id'])
+        product['category_id'] = str(product['category_id'])
+        product['cost'] = str(product['cost'].to_decimal())
+        product['created_at'] = product['created_at'].isoformat()
+        product['updated_at'] = product['updated_at'].isoformat()
+        product['category']['_id'] = str(product['category']['_id'])
+    return provider.dumps({"products": products})
+
+
+def time_serialize(serialize, count, rounds):
+    """Return the median throughput in documents per second"""
+    samples = []
+    for _ in range(rounds):
+        products = make_products(count)
+        start = time.perf_counter()
+        serialize(products)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return count / samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    candidates = {
+        "legacy loop + default": lambda products: legacy_serialize(DefaultJSONProvider(crud_app.app), products),
+        "MongoJSONProvider": lambda products: crud_app.MongoJSONProvider(crud_app.app).dumps({"products": products}),
+    }
+    if crud_app.orjson is not None:
+        candidates["OrjsonMongoJSONProvider"] = (
+            lambda products: crud_app.OrjsonMongoJSONProvider(crud_app.app).dumps({"products": products})
+        )
+    else:
+        print("orjson is not installed; skipping the orjson backend")
+
+    print(f"{'provider':<26} " + " ".join(f"{f'{count} docs/s':>14}" for count in DOCUMENT_COUNTS))
+    for name, serialize in candidates.items():
+        rates = [time_serialize(serialize, count, args.rounds) for count in DOCUMENT_COUNTS]
+        print(f"{name:<26} " + " ".join(f"{rate:>14,.0f}" for rate in rates))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Benchmark: product payload validation
+Compares the legacy per-record dataclass checks with the compiled marshmallow
+ProductSchema, loaded one record at a time, with many=True, and column-wise
+through ProductBatchValidator (the bulk create and import path). Payloads
+look like parsed CSV rows (string prices and quantities, split tags), with
+every tenth row invalid.
+
+Runs without MongoDB; category resolution is not part of the timing.
+Usage: python benchmarks/bench_validation.py [--rounds 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson.objectid import ObjectId
+from marshmallow import ValidationError
+
+import app as crud_app
+
+RECORD_COUNT = 10000
+
+
+def make_rows(count):
+    """Build import rows, every tenth one failing validation"""
+    category_id = str(ObjectId())
+    rows = []
+    for i in range(count):
+        row = {
+            "name": f"Product {i}",
+            "description": "Benchmark product description",
+            "category_id": category_id,
+            "price": f"{10 + i % 90}.99",
+            "quantity": str(i % 50),
+            "tags": ["bench", " validation ", ""],
+            "status": "active"
+        }
+        if i % 10 == 0:
+            row["price"] = "-1"
+            row["status"] = "archived"
+        rows.append(row)
+    return rows
+
+
+def legacy_validate(rows):
+    """The pre-schema behaviour: coerce, build a dataclass-like record and re-check every field"""
+    valid, errors = [], []
+    for i, row in enumerate(rows):
+        try:
+            name, description = str(row['name']), str(row['description'])
+            price, quantity = float(row['price']), int(row['quantity'])
+            status = row.get('status') or crud_app.ProductStatus.ACTIVE.value
+        except (KeyError, TypeError, ValueError) as e:
+            errors.append({"index": i, "errors": {"general": str(e)}})
+            continue
+        row_errors = {}
+        if not name or len(name.strip()) < 2:
+            row_errors['name'] = 'Name must be at least 2 characters long'
+        if not description or len(description.strip()) < 10:
+            row_errors['description'] = 'Description must be at least 10 characters long'
+        if price <= 0:
+            row_errors['price'] = 'Price must be greater than 0'
+        if quantity < 0:
+            row_errors['quantity'] = 'Quantity cannot be negative'
+        if status not in [status.value for status in crud_app.ProductStatus]:
+            row_errors['status'] = 'Invalid status'
+        if not ObjectId.is_valid(row['category_id']):
+            row_errors['category_id'] = 'Invalid category ID'
+        if row_errors:
+            errors.append({"index": i, "errors": row_errors})
+            continue
+        valid.append({
+            "name": name.strip(),
+            "description": description.strip(),
+            "category_id": ObjectId(row['category_id']),
+            "price": price,
+            "quantity": quantity,
+            "tags": [tag.strip() for tag in row.get('tags') or [] if tag.strip()],
+            "status": status
+        })
+    return valid, errors
+
+
+def schema_load_each(rows):
+    """One ProductSchema.load call per record"""
+    valid, errors = [], []
+    for i, row in enumerate(rows):
+        try:
+            valid.append(crud_app.product_schema.load(row))
+        except ValidationError as e:
+            errors.append({"index": i, "errors": e.messages})
+    return valid, errors
+
+
+def schema_load_many(rows, schema=crud_app.ProductSchema(many=True)):
+    """A single many=True load; errors come back keyed by index"""
+    try:
+        return schema.load(rows), {}
+    except ValidationError as e:
+        return e.valid_data, e.messages
+
+
+def time_validate(validate, rows, rounds):
+    """Return the median time in milliseconds to validate the rows"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        validate(rows)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=10)
+    args = parser.parse_args()
+
+    rows = make_rows(RECORD_COUNT)
+    candidates = {
+        "legacy per-record checks": legacy_validate,
+        "schema.load per record": schema_load_each,
+        "schema.load many=True": schema_load_many,
+        "column-wise batch": crud_app.product_batch_validator.validate,
+    }
+
+    print(f"{'validator':<26} {'ms / 10k':>10} {'records/s':>12}")
+    for name, validate in candidates.items():
+        elapsed = time_validate(validate, rows, args.rounds) * RECORD_COUNT / len(rows)
+        print(f"{name:<26} {elapsed:>10.1f} {RECORD_COUNT / elapsed * 1000:>12,.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Gunicorn configuration for the production entry point.
+
+    gunicorn -c gunicorn.conf.py
+
+Every worker builds its own MongoClient after fork: without preload the
+app module is imported inside the worker, and with GUNICORN_PRELOAD=true
+the post_fork hook replaces the client inherited from the master.
+Pool sizing is per worker, so MONGO_MAX_POOL_SIZE should cover
+GUNICORN_THREADS plus the background writer threads.
+
+Workers do not create indexes; apply schema migrations once per deploy
+before starting or reloading gunicorn:
+
+    flask --app app migrate
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = "app:create_app()"
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', 5000)}")
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 0))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() == 'true'
+accesslog = os.getenv('GUNICORN_ACCESSLOG', '-')
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """Replace any MongoClient and watcher thread inherited from a preloaded master"""
+    if preload_app:
+        import app as crud_app
+        crud_app.create_app()
+
+
+def worker_exit(server, worker):
+    """Flush buffered audit entries and view counts before the worker goes away"""
+    import app as crud_app
+    crud_app.view_counter.stop()
+    # Leave headroom inside graceful_timeout; the writer drops what it cannot flush in time
+    crud_app.audit_writer.stop(timeout=graceful_timeout / 3)